@@ -0,0 +1,22 @@
+"""Offline benchmarks of the Meteo.gr integration."""
+
+import importlib
+from pathlib import Path
+import sys
+import types
+
+COMPONENT_DIR = Path(__file__).parents[1] / "custom_components" / "meteogr"
+
+
+def load_integration_module(name: str) -> types.ModuleType:
+    """Import a module of the integration without Home Assistant.
+
+    The package is registered without running its __init__, which sets up
+    the integration in Home Assistant, so that the modules which do not
+    depend on Home Assistant can be imported on their own.
+    """
+    if "meteogr" not in sys.modules:
+        package = types.ModuleType("meteogr")
+        package.__path__ = [str(COMPONENT_DIR)]
+        sys.modules["meteogr"] = package
+    return importlib.import_module(f"meteogr.{name}")
@@ -0,0 +1,141 @@
+"""Pages the benchmarks run over.
+
+Recorded pages are read from the pages directory next to this file. Record
+some with:
+
+    python -m benchmarks.record 88 12 1
+
+Synthetic pages with the same markup as meteo.gr cover the edge cases the
+parsers have to handle, so the suite also runs without any recording.
+"""
+
+from datetime import date, timedelta
+from pathlib import Path
+import random
+
+PAGES_DIR = Path(__file__).parent / "pages"
+
+MONTHS = [
+    "January",
+    "February",
+    "March",
+    "April",
+    "May",
+    "June",
+    "July",
+    "August",
+    "September",
+    "October",
+    "November",
+    "December",
+]
+DIRECTIONS = ["N", "NE", "E", "SE", "S", "SW", "W", "NW"]
+PREDICTIONS = [
+    "Clear",
+    "Few Clouds",
+    "Partly Cloudy",
+    "Cloudy",
+    "Light Rain",
+    "Rain",
+    "Storm",
+]
+
+
+def _station(rng: random.Random, number: int, humidity: bool) -> str:
+    """Return the markup of a live station."""
+    humid = (
+        f'<div class="humid"><img src="/humidity.png"/>{rng.randint(20, 99)}%</div>'
+        f'<div class="humid"><img src="/pressure.png"/>{rng.uniform(990, 1035):.1f} hPa</div>'
+        if humidity
+        else ""
+    )
+    return (
+        f'<div class="nowHead2">Station {number}<span class="nowtime">12:50</span></div>'
+        '<div class="nowpanel">'
+        f'<div class="nowtemp">{rng.uniform(-8, 42):.1f} &deg;C</div>{humid}'
+        f'<div class="windnumber">{rng.uniform(0, 80):.1f} km/h</div>'
+        f'<div class="nowbeaufort">{rng.randint(0, 10)} Bf</div>'
+        f'<div class="winddirection"> <span>{rng.choice(DIRECTIONS)}</span> </div>'
+        "</div>"
+    )
+
+
+def _hour(rng: random.Random, hour: int) -> str:
+    """Return the markup of an hourly forecast row."""
+    return (
+        '<tr class="perhour rowmargin">'
+        f"<td><table><tr><td> {hour:02d}:00 </td></tr></table></td>"
+        f'<td class="temperature"><img src="/t.png"/>{rng.randint(-8, 42)} &deg;C</td>'
+        f'<td class="humidity">{rng.randint(20, 99)}%</td>'
+        '<td class="anemosfull"><table><tr><td>'
+        f"{rng.randint(0, 10)} Bf {rng.choice(DIRECTIONS)}<br/>"
+        f"<span>{rng.randint(0, 80)} km/h</span></td></tr></table></td>"
+        f'<td class="phenomeno-name">{rng.choice(PREDICTIONS)}<br/></td>'
+        "</tr>"
+    )
+
+
+def synthetic_page(
+    start: date,
+    days: int = 7,
+    stations: int = 6,
+    step: int = 1,
+    dust: bool = False,
+    humidity: bool = True,
+    seed: int = 0,
+) -> str:
+    """Return a page laid out like a meteo.gr city page."""
+    rng = random.Random(seed)
+    parts = [
+        "<!DOCTYPE html><html><head><title>meteo.gr</title>",
+        '<script>var menu = "<div>";</script></head><body>',
+        "<nav>" + '<a href="/">Menu entry</a>' * 300 + "</nav>",
+        '<div class="ads">' + "<iframe></iframe>" * 20 + "</div>",
+        '<div id="live">',
+    ]
+    parts.extend(
+        _station(rng, number, humidity or number % 2) for number in range(stations)
+    )
+    parts.append("</div>")
+    day = start
+    for number in range(days):
+        parts.append(
+            f'<table id="outerTable{number}" class="forecastTable">'
+            '<tr><td class="forecastDate">'
+            f'<span class="dayNumbercf">{day.day} </span>'
+            f'<span class="monthNumbercf"> {MONTHS[day.month - 1]} </span>'
+            "</td></tr>"
+        )
+        if dust:
+            parts.append(
+                '<tr><td><div id="dust"><table><tr class="perhour">'
+                "<td><table><tr><td>00:00</td></tr></table></td>"
+                '<td class="phenomeno-name">Dust</td></tr></table></div></td></tr>'
+            )
+        parts.extend(_hour(rng, hour) for hour in range(0, 24, step))
+        parts.append("</table>")
+        # The desktop layout repeats the forecast in tables the parsers skip
+        parts.append(
+            f'<table id="outerTable{number}d" class="hidden-xs">'
+            + "".join(_hour(rng, hour) for hour in range(0, 24, step))
+            + "</table>"
+        )
+        day += timedelta(days=1)
+    parts.append("<footer>" + "<p>Footer text</p>" * 400 + "</footer></body></html>")
+    return "\n".join(parts)
+
+
+def load_corpus() -> dict[str, str]:
+    """Return the pages to benchmark by name."""
+    today = date.today()
+    corpus = {
+        "synthetic/typical": synthetic_page(today, step=3),
+        "synthetic/hourly": synthetic_page(today, days=10),
+        "synthetic/dust": synthetic_page(today, step=3, dust=True),
+        "synthetic/missing_humidity": synthetic_page(today, step=3, humidity=False),
+        "synthetic/year_rollover": synthetic_page(date(today.year, 12, 28), step=3),
+        "synthetic/no_stations": synthetic_page(today, step=3, stations=0),
+    }
+    for path in sorted(PAGES_DIR.glob("*.html")):
+        corpus[f"recorded/{path.stem}"] = path.read_text(encoding="utf-8")
+    return corpus
@@ -0,0 +1,280 @@
+"""Load test the fetch and parse pipeline against the local stand-in.
+
+Many scrapers update in rounds through the shared fetcher, as the
+coordinators of as many cities do, against the stand-in of meteo.gr run in
+a process of its own. From the repository root:
+
+    python -m benchmarks.load --scrapers 300 --rounds 5
+    python -m benchmarks.load --scrapers 300 --latency 0.5 --jitter 2 --hedge
+    python -m benchmarks.load --error-rate 0.05 --truncate-rate 0.05
+
+Reports the throughput of the updates, percentiles of the update and fetch
+latency, how late the event loop ran its callbacks and memory use. The
+coordinators need Home Assistant, so the scrapers are driven directly, and
+pages are parsed in threads since the worker processes could not import
+the integration without it.
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+from pathlib import Path
+import resource
+import socket
+import sys
+import time
+import tracemalloc
+
+import aiohttp
+
+from . import load_integration_module
+from .stand_in import add_fault_arguments, faults_from_arguments, serve
+
+api = load_integration_module("api")
+fetcher_module = load_integration_module("fetcher")
+
+# How often the event loop lag is sampled
+LAG_PERIOD = 0.01  # seconds
+
+
+def percentiles(samples: list[float]) -> dict[str, float | None]:
+    """Return a summary of samples."""
+    if not samples:
+        return {"count": 0}
+    ordered = sorted(samples)
+    return {
+        "count": len(ordered),
+        "p50": ordered[int(0.5 * (len(ordered) - 1))],
+        "p90": ordered[int(0.9 * (len(ordered) - 1))],
+        "p99": ordered[int(0.99 * (len(ordered) - 1))],
+        "max": ordered[-1],
+    }
+
+
+async def sample_lag(samples: list[float]) -> None:
+    """Record how much later than asked the event loop wakes up."""
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(LAG_PERIOD)
+        samples.append(loop.time() - start - LAG_PERIOD)
+
+
+async def timed_update(scraper, forecast: bool, latencies: list[float]) -> bool:
+    """Update a scraper, recording how long it took."""
+    start = time.monotonic()
+    success = await scraper.update(forecast=forecast)
+    latencies.append(time.monotonic() - start)
+    return success
+
+
+async def run(args: argparse.Namespace, base_url: str) -> dict:
+    """Run the rounds of updates and return the report."""
+    if args.trace_memory:
+        tracemalloc.start()
+    fetcher = None
+    if args.fetcher:
+        fetcher = fetcher_module.MeteoGrFetcher(
+            args.max_concurrent, args.fetch_rate, args.fetch_burst
+        )
+        session = fetcher.session
+    else:
+        session = aiohttp.ClientSession()
+
+    scrapers = []
+    for number in range(args.scrapers):
+        city_id = number % args.cities + 1
+        scraper = api.MeteoGrScraper(
+            session, city_id, parser_backend=args.parser, fetcher=fetcher
+        )
+        scraper.url = f"{base_url}/cf-en.cfm?city_id={city_id}"
+        scraper.timeout = aiohttp.ClientTimeout(
+            sock_connect=args.connect_timeout, sock_read=args.read_timeout
+        )
+        scraper.update_timeout = args.update_timeout
+        scraper.hedge = args.hedge
+        scraper.streaming = args.stream
+        scraper.stop_early = args.stop_early
+        scrapers.append(scraper)
+
+    lags: list[float] = []
+    lag_task = asyncio.create_task(sample_lag(lags))
+    latencies: list[float] = []
+    results = []
+    start = time.monotonic()
+    try:
+        for round_number in range(args.rounds):
+            if round_number:
+                await asyncio.sleep(args.interval)
+            # Each round polls anew, as if an update interval had passed
+            api._recent_responses.clear()
+            forecast = round_number % args.forecast_every == 0
+            results += await asyncio.gather(
+                *(timed_update(scraper, forecast, latencies) for scraper in scrapers)
+            )
+        elapsed = time.monotonic() - start
+    finally:
+        lag_task.cancel()
+        if fetcher is not None:
+            await fetcher.close()
+        else:
+            await session.close()
+
+    fetch_latencies = [
+        latency for scraper in scrapers for latency in scraper.metrics.fetch_latency
+    ]
+    counters = {
+        name: sum(getattr(scraper.metrics, name) for scraper in scrapers)
+        for name in (
+            "requests",
+            "coalesced",
+            "not_modified",
+            "unchanged",
+            "hedged",
+            "stopped_early",
+            "timeouts",
+            "failures",
+        )
+    }
+    report = {
+        "scrapers": args.scrapers,
+        "cities": args.cities,
+        "rounds": args.rounds,
+        "updates": len(results),
+        "succeeded": sum(results),
+        "seconds": round(elapsed, 3),
+        "updates_per_second": round(len(results) / elapsed, 1),
+        "update_latency": percentiles(latencies),
+        "fetch_latency": percentiles(fetch_latencies),
+        "loop_lag": percentiles(lags),
+        "counters": counters,
+        # Kibibytes on Linux
+        "max_rss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+    if args.trace_memory:
+        report["traced_peak_kib"] = round(tracemalloc.get_traced_memory()[1] / 1024)
+        tracemalloc.stop()
+    return report
+
+
+def print_report(report: dict) -> None:
+    """Print the report as a table."""
+    print(
+        f"{report['updates']} updates of {report['scrapers']} scrapers"
+        f" ({report['cities']} cities) in {report['seconds']} s,"
+        f" {report['updates_per_second']} per second,"
+        f" {report['succeeded']} succeeded"
+    )
+    print(f"{'seconds':<16} {'p50':>10} {'p90':>10} {'p99':>10} {'max':>10}")
+    for name in ("update_latency", "fetch_latency", "loop_lag"):
+        summary = report[name]
+        if not summary["count"]:
+            continue
+        print(
+            f"{name:<16}"
+            + "".join(f" {summary[key]:>10.4f}" for key in ("p50", "p90", "p99", "max"))
+        )
+    print(", ".join(f"{name} {count}" for name, count in report["counters"].items()))
+    memory = f"max RSS {report['max_rss_kib'] / 1024:.1f} MiB"
+    if "traced_peak_kib" in report:
+        memory += f", traced peak {report['traced_peak_kib'] / 1024:.1f} MiB"
+    print(memory)
+
+
+def free_port() -> int:
+    """Return a local TCP port nothing listens on."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def wait_for_server(url: str, timeout: float = 10) -> None:
+    """Wait until the stand-in answers."""
+    deadline = time.monotonic() + timeout
+    async with aiohttp.ClientSession() as session:
+        while True:
+            try:
+                async with session.get(f"{url}/cf-en.cfm?city_id=0"):
+                    return
+            except aiohttp.ClientError:
+                if time.monotonic() > deadline:
+                    raise
+                await asyncio.sleep(0.1)
+
+
+def main() -> int:
+    """Run the load test."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scrapers", type=int, default=200)
+    parser.add_argument(
+        "--cities", type=int, help="distinct cities, the scrapers by default"
+    )
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument(
+        "--interval", type=float, default=0, help="seconds between rounds"
+    )
+    parser.add_argument(
+        "--forecast-every",
+        type=int,
+        default=1,
+        help="include the forecast every this many rounds",
+    )
+    parser.add_argument("--parser", help="parser backend, the fastest by default")
+    parser.add_argument(
+        "--fetcher",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="throttle the requests through the shared fetcher",
+    )
+    parser.add_argument("--max-concurrent", type=int, default=32)
+    parser.add_argument("--fetch-rate", type=float, default=1000.0)
+    parser.add_argument("--fetch-burst", type=int, default=100)
+    parser.add_argument("--connect-timeout", type=float, default=10)
+    parser.add_argument("--read-timeout", type=float, default=20)
+    parser.add_argument("--update-timeout", type=float, default=60)
+    parser.add_argument("--hedge", action="store_true")
+    parser.add_argument(
+        "--stream", action="store_true", help="read only the sections of pages"
+    )
+    parser.add_argument(
+        "--stop-early",
+        action="store_true",
+        help="stop streamed pages at the footer after their sections",
+    )
+    parser.add_argument(
+        "--url", help="base URL of a running stand-in, started here by default"
+    )
+    parser.add_argument("--trace-memory", action="store_true")
+    parser.add_argument("--output", type=Path, help="save the report as JSON")
+    add_fault_arguments(parser)
+    args = parser.parse_args()
+    args.cities = args.cities or args.scrapers
+
+    server = None
+    base_url = args.url
+    if base_url is None:
+        port = free_port()
+        base_url = f"http://127.0.0.1:{port}"
+        server = multiprocessing.get_context("spawn").Process(
+            target=serve,
+            args=(faults_from_arguments(args), "127.0.0.1", port),
+            daemon=True,
+        )
+        server.start()
+    try:
+        asyncio.run(wait_for_server(base_url))
+        report = asyncio.run(run(args, base_url))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.join()
+
+    print_report(report)
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
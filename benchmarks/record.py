@@ -0,0 +1,73 @@
+"""Record meteo.gr city pages into the benchmark corpus.
+
+From the repository root, with access to meteo.gr:
+
+    python -m benchmarks.record 88 12 1
+
+Saves every page as pages/city_<id>.html next to this file, where the
+benchmarks, the backend parity check and the stand-in pick it up. Scripts
+and styles are stripped, since nothing parses them, unless --keep-scripts is
+given. Also tells whether the footer follows the sections, which streamed
+updates need to stop reading early.
+"""
+
+import argparse
+import asyncio
+import re
+import sys
+
+import aiohttp
+
+from . import load_integration_module
+from .corpus import PAGES_DIR
+
+api = load_integration_module("api")
+parsing = load_integration_module("parsing")
+
+_SCRIPTS = re.compile(r"<(script|style)\b.*?</\1\s*>", re.I | re.S)
+
+
+async def record(city_ids: list[int], keep_scripts: bool) -> bool:
+    """Record the pages of cities, returning whether all were recorded."""
+    PAGES_DIR.mkdir(exist_ok=True)
+    recorded = True
+    async with aiohttp.ClientSession() as session:
+        for city_id in city_ids:
+            scraper = api.MeteoGrScraper(session, city_id)
+            try:
+                async with session.get(
+                    scraper.url, headers=scraper.headers, timeout=scraper.timeout
+                ) as response:
+                    response.raise_for_status()
+                    html = await response.text()
+            except (aiohttp.ClientError, TimeoutError) as err:
+                print(f"city {city_id}: {err!r}")
+                recorded = False
+                continue
+            if not keep_scripts:
+                html = _SCRIPTS.sub("", html)
+            path = PAGES_DIR / f"city_{city_id}.html"
+            path.write_text(html, encoding="utf-8")
+
+            scanner = parsing.SectionScanner()
+            scanner.feed(html)
+            live, forecast = parsing.get_parser().parse(html)
+            print(
+                f"city {city_id}: {len(html)} characters, {len(live)} stations,"
+                f" {len(forecast)} forecast rows, footer after the sections:"
+                f" {'yes' if scanner.complete else 'no'} -> {path}"
+            )
+    return recorded
+
+
+def main() -> int:
+    """Record the pages given on the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("city_ids", type=int, nargs="+")
+    parser.add_argument("--keep-scripts", action="store_true")
+    args = parser.parse_args()
+    return 0 if asyncio.run(record(args.city_ids, args.keep_scripts)) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
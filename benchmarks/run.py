@@ -0,0 +1,211 @@
+"""Benchmark parsing and the forecast views over the page corpus.
+
+Nothing is fetched, so the numbers only depend on the code and the pages.
+From the repository root:
+
+    python -m benchmarks.run                        # print a report
+    python -m benchmarks.run --output before.json   # also save it
+    python -m benchmarks.run --compare before.json  # compare with a saved one
+
+Needs beautifulsoup4, and lxml to benchmark that backend too, but not Home
+Assistant. Exits with an error when the backends disagree on a page or, when
+comparing, when a measurement regressed by more than the threshold.
+"""
+
+import argparse
+from collections.abc import Callable
+import gc
+import json
+from pathlib import Path
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+from . import load_integration_module
+from .corpus import load_corpus
+
+parsing = load_integration_module("parsing")
+forecast = load_integration_module("forecast")
+
+# Measurements compared for regressions
+COMPARED = ("time_ms", "peak_kib")
+
+
+def measure(func: Callable[[], object], repeat: int) -> dict[str, float]:
+    """Return the run time and the memory use of a function."""
+    func()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    result = func()
+    # Only count what the result keeps alive, not garbage awaiting collection
+    gc.collect()
+    snapshot = tracemalloc.take_snapshot()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    retained = snapshot.statistics("filename")
+    del result
+
+    return {
+        "time_ms": round(statistics.median(times) * 1000, 3),
+        "min_ms": round(min(times) * 1000, 3),
+        "peak_kib": round(peak / 1024, 1),
+        "retained_kib": round(sum(stat.size for stat in retained) / 1024, 1),
+        "retained_blocks": sum(stat.count for stat in retained),
+    }
+
+
+def available_parsers() -> list:
+    """Return the parser backends that can run here."""
+    parsers = [parsing.get_parser(parsing.PARSER_BEAUTIFULSOUP)]
+    if parsing.lxml_html is not None:
+        parsers.append(parsing.get_parser(parsing.PARSER_LXML))
+    return parsers
+
+
+def benchmark_page(html: str, parsers: list, repeat: int) -> tuple[dict, list[str]]:
+    """Return the measurements of a page and the backends disagreeing on it."""
+    results = {}
+    outputs = {}
+    live_markup = parsing.extract_live(html)
+    forecast_markup = parsing.extract_forecast(html)
+
+    for parser in parsers:
+        results[f"live/{parser.name}"] = measure(
+            lambda parser=parser: parser.parse_live(parsing.extract_live(html)),
+            repeat,
+        )
+        results[f"forecast/{parser.name}"] = measure(
+            lambda parser=parser: parser.parse_forecast(
+                parsing.extract_forecast(html)
+            ),
+            repeat,
+        )
+
+        def parse_document(parser=parser):
+            """Parse the whole document, as done before the page was sliced."""
+            tree = parser._build(html)
+            return parser._parse_live_stations(tree), parser._parse_forecast(tree)
+
+        results[f"full_document/{parser.name}"] = measure(parse_document, repeat)
+        outputs[parser.name] = (
+            parser.parse_live(live_markup),
+            parser.parse_forecast(forecast_markup),
+        )
+
+    reference_name, reference = next(iter(outputs.items()))
+    mismatches = [name for name, output in outputs.items() if output != reference]
+    if mismatches:
+        mismatches.insert(0, reference_name)
+
+    hourly = reference[1]
+    results["hourly"] = measure(
+        lambda: forecast.build_hourly_forecast(hourly), repeat * 10
+    )
+    results["daily"] = measure(
+        lambda: forecast.build_daily_forecast(hourly), repeat * 10
+    )
+    series = forecast.ForecastSeries(hourly)
+    results["interpolated"] = measure(
+        lambda: forecast.build_interpolated_forecast(series, 60), repeat * 10
+    )
+    return results, mismatches
+
+
+def print_report(report: dict) -> None:
+    """Print the measurements as a table."""
+    print(
+        f"{'benchmark':<60} {'median ms':>10} {'min ms':>10} {'peak KiB':>10}"
+        f" {'kept KiB':>10} {'kept blocks':>12}"
+    )
+    for name, result in report["results"].items():
+        print(
+            f"{name:<60} {result['time_ms']:>10.3f} {result['min_ms']:>10.3f}"
+            f" {result['peak_kib']:>10.1f} {result['retained_kib']:>10.1f}"
+            f" {result['retained_blocks']:>12}"
+        )
+
+
+def compare(report: dict, baseline: dict, threshold: float) -> bool:
+    """Print the changes against a baseline, returning whether any regressed."""
+    regressed = False
+    print(f"\n{'benchmark':<60} {'measure':<10} {'before':>10} {'after':>10} {'change':>8}")
+    for name, result in report["results"].items():
+        if (before := baseline["results"].get(name)) is None:
+            continue
+        for key in COMPARED:
+            if not before[key]:
+                continue
+            change = (result[key] - before[key]) / before[key] * 100
+            flag = ""
+            if change > threshold:
+                flag = "  REGRESSION"
+                regressed = True
+            print(
+                f"{name:<60} {key:<10} {before[key]:>10} {result[key]:>10}"
+                f" {change:>+7.1f}%{flag}"
+            )
+    return regressed
+
+
+def main() -> int:
+    """Run the benchmarks."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20, help="runs per measurement")
+    parser.add_argument("--output", type=Path, help="save the report as JSON")
+    parser.add_argument("--compare", type=Path, help="JSON report to compare with")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=10.0,
+        help="change in percent counted as a regression",
+    )
+    parser.add_argument(
+        "--require-recorded",
+        action="store_true",
+        help="fail unless recorded meteo.gr pages are in the corpus",
+    )
+    args = parser.parse_args()
+
+    parsers = available_parsers()
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "parsers": [parser.name for parser in parsers],
+        },
+        "results": {},
+    }
+    failed = False
+    corpus = load_corpus()
+    if not any(name.startswith("recorded/") for name in corpus):
+        print(
+            "No recorded pages in benchmarks/pages, so the results only cover"
+            " synthetic markup. Record some with python -m benchmarks.record."
+        )
+        failed = args.require_recorded
+    for page_name, html in corpus.items():
+        results, mismatches = benchmark_page(html, parsers, args.repeat)
+        for name, result in results.items():
+            report["results"][f"{page_name}/{name}"] = result
+        if mismatches:
+            print(f"Backends disagree on {page_name}: {', '.join(mismatches)}")
+            failed = True
+
+    print_report(report)
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        failed |= compare(report, baseline, args.threshold)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
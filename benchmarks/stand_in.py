@@ -0,0 +1,174 @@
+"""A local stand-in for meteo.gr, serving city pages with injected faults.
+
+Serves `/cf-en.cfm?city_id=<id>` like meteo.gr does. Cities with a recorded
+page in the pages directory, named `city_<id>.html`, get that page, the
+others a synthetic page of their own. From the repository root:
+
+    python -m benchmarks.stand_in --port 8080 --latency 0.2 --error-rate 0.05
+
+Pages carry an ETag and conditional requests of an unchanged page are
+answered with 304, so the scrapers behave as against meteo.gr. Each page
+changes after a share of the requests, set by the change rate.
+"""
+
+import argparse
+import asyncio
+from dataclasses import dataclass, fields
+from datetime import date
+import hashlib
+import random
+
+from aiohttp import web
+
+from .corpus import PAGES_DIR, synthetic_page
+
+
+@dataclass
+class Faults:
+    """What the stand-in does to its responses."""
+
+    # Seconds to wait before answering, and up to how many more at random
+    latency: float = 0.0
+    jitter: float = 0.0
+    # Share of the requests answered with a server error
+    error_rate: float = 0.0
+    # Share of the requests after which the page of the city changes
+    change_rate: float = 0.0
+    # Whether to send an ETag and answer conditional requests with 304
+    etags: bool = True
+    # Share of the bodies cut short by closing the connection midway
+    truncate_rate: float = 0.0
+    # Send bodies in chunks of this many bytes, this many seconds apart
+    chunk_size: int = 0
+    chunk_delay: float = 0.0
+
+
+class StandIn:
+    """The pages of the stand-in and the handler serving them."""
+
+    def __init__(self, faults: Faults, seed: int = 0) -> None:
+        """Initialize the stand-in."""
+        self.faults = faults
+        self.rng = random.Random(seed)
+        self.today = date.today()
+        # Current version of the page of every city asked for
+        self.versions: dict[int, int] = {}
+        self._pages: dict[tuple[int, int], tuple[bytes, str]] = {}
+        self.requests = 0
+
+    def page(self, city_id: int) -> tuple[bytes, str]:
+        """Return the current page of a city and its ETag."""
+        version = self.versions.setdefault(city_id, 0)
+        if (page := self._pages.get((city_id, version))) is None:
+            path = PAGES_DIR / f"city_{city_id}.html"
+            if path.exists():
+                # A recorded page only changes outside the parsed sections
+                html = path.read_text(encoding="utf-8")
+                html += f"<!-- version {version} -->"
+            else:
+                html = synthetic_page(
+                    self.today, step=3, seed=city_id * 1000 + version
+                )
+            body = html.encode()
+            etag = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+            # Older versions are never served again
+            self._pages.pop((city_id, version - 1), None)
+            page = self._pages[(city_id, version)] = (body, etag)
+        return page
+
+    async def handle(self, request: web.Request) -> web.StreamResponse:
+        """Answer a request for a city page."""
+        faults = self.faults
+        self.requests += 1
+        try:
+            city_id = int(request.query["city_id"])
+        except (KeyError, ValueError):
+            raise web.HTTPBadRequest from None
+        body, etag = self.page(city_id)
+        if self.rng.random() < faults.change_rate:
+            self.versions[city_id] += 1
+
+        delay = faults.latency + self.rng.uniform(0, faults.jitter)
+        if delay:
+            await asyncio.sleep(delay)
+        if self.rng.random() < faults.error_rate:
+            raise web.HTTPInternalServerError
+        if not faults.etags:
+            etag = None
+        elif request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304, headers={"ETag": etag})
+
+        response = web.StreamResponse(
+            headers={"Content-Type": "text/html; charset=utf-8"}
+        )
+        if etag:
+            response.headers["ETag"] = etag
+        response.content_length = len(body)
+        await response.prepare(request)
+        end = len(body)
+        if self.rng.random() < faults.truncate_rate:
+            end = self.rng.randrange(end)
+        step = faults.chunk_size or end or 1
+        try:
+            for start in range(0, end, step):
+                await response.write(body[start : min(start + step, end)])
+                if faults.chunk_delay:
+                    await asyncio.sleep(faults.chunk_delay)
+        except ConnectionResetError:
+            # Streaming clients hang up once they read what they need
+            return response
+        if end < len(body):
+            # The client sees the connection close before the whole body
+            request.transport.close()
+            return response
+        await response.write_eof()
+        return response
+
+    def application(self) -> web.Application:
+        """Return the web application of the stand-in."""
+        app = web.Application()
+        app.router.add_get("/cf-en.cfm", self.handle)
+        return app
+
+
+def serve(faults: Faults, host: str, port: int, seed: int = 0) -> None:
+    """Serve until interrupted."""
+    web.run_app(
+        StandIn(faults, seed).application(),
+        host=host,
+        port=port,
+        access_log=None,
+        print=None,
+    )
+
+
+def add_fault_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add an option for every fault to a command line parser."""
+    for field in fields(Faults):
+        option = "--" + field.name.replace("_", "-")
+        if field.type is bool:
+            parser.add_argument(
+                option, action=argparse.BooleanOptionalAction, default=field.default
+            )
+        else:
+            parser.add_argument(option, type=field.type, default=field.default)
+
+
+def faults_from_arguments(args: argparse.Namespace) -> Faults:
+    """Return the faults given on the command line."""
+    return Faults(**{field.name: getattr(args, field.name) for field in fields(Faults)})
+
+
+def main() -> None:
+    """Serve until interrupted."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--seed", type=int, default=0)
+    add_fault_arguments(parser)
+    args = parser.parse_args()
+    serve(faults_from_arguments(args), args.host, args.port, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,38 @@
 """The Meteo.gr integration."""
 
+from datetime import timedelta
+
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
-
-from .api import MeteoGrScraper
-from .const import CONF_CITY_ID, CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL, DOMAIN
-from .coordinator import MeteoGrDataUpdateCoordinator
+from homeassistant.exceptions import ConfigEntryNotReady
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.typing import ConfigType
+
+from .api import shutdown_parse_pool
+from .const import (
+    CONF_CITY_ID,
+    CONF_MAX_STALENESS,
+    DATA_CITY_COORDINATORS,
+    DEFAULT_MAX_STALENESS,
+    DOMAIN,
+)
+from .coordinator import (
+    async_acquire_coordinator,
+    async_release_coordinator,
+    async_remove_stored_data,
+)
+from .services import async_setup_services
 
 PLATFORMS = ["sensor", "weather"]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Meteo.gr services."""
+    async_setup_services(hass)
+    return True
+
 
 async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Reload the config entry when options are updated."""
@@ -18,18 +41,29 @@ async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Meteo.gr from a config entry."""
-    session = async_get_clientsession(hass)
-    city_id = entry.data[CONF_CITY_ID]
-
-    # Get update interval from options, or use default
-    update_interval = entry.options.get(CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL)
-
-    api = MeteoGrScraper(session, city_id)
-
-    # Pass the update_interval to the coordinator
-    coordinator = MeteoGrDataUpdateCoordinator(hass, api, update_interval)
-
-    await coordinator.async_config_entry_first_refresh()
+    # Entries of the same city share one coordinator, which may already
+    # hold data fetched for another station
+    coordinator = async_acquire_coordinator(hass, entry)
+    max_staleness = timedelta(
+        minutes=entry.options.get(CONF_MAX_STALENESS, DEFAULT_MAX_STALENESS)
+    )
+
+    # Only the first entry restores or refreshes, the others use its data
+    async with coordinator.first_data_lock:
+        if coordinator.data is None and await coordinator.async_restore(
+            max_staleness
+        ):
+            # Start from the data of the last run instead of waiting on meteo.gr
+            entry.async_create_background_task(
+                hass,
+                coordinator.async_refresh(),
+                f"{DOMAIN}_{entry.entry_id}_refresh",
+            )
+        elif coordinator.data is None or not coordinator.last_update_success:
+            await coordinator.async_refresh()
+            if not coordinator.last_update_success:
+                await async_release_coordinator(hass, entry)
+                raise ConfigEntryNotReady("Error communicating with meteo.gr")
 
     unsub_listener = entry.add_update_listener(async_reload_entry)
 
@@ -50,5 +84,19 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     if unload_ok:
         entry_data = hass.data[DOMAIN].pop(entry.entry_id)
         entry_data["unsub_listener"]()  # Call the unsubscribe function
+        await async_release_coordinator(hass, entry)
+        if not hass.data[DATA_CITY_COORDINATORS]:
+            shutdown_parse_pool()
 
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the stored data when the last entry of a city is removed."""
+    city_id = entry.data[CONF_CITY_ID]
+    if not any(
+        other.data[CONF_CITY_ID] == city_id
+        for other in hass.config_entries.async_entries(DOMAIN)
+        if other.entry_id != entry.entry_id
+    ):
+        await async_remove_stored_data(hass, city_id)
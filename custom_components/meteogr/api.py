@@ -1,221 +1,625 @@
 """API client for fetching weather data from meteo.gr."""
 
-from datetime import date, datetime
+import asyncio
+import codecs
+from collections.abc import Awaitable, Callable, Hashable
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import nullcontext
+import hashlib
+from http import HTTPStatus
+from importlib.util import find_spec
 import logging
-import re
+import multiprocessing
+from operator import attrgetter
+import time
+from typing import TYPE_CHECKING, NamedTuple
 
 import aiohttp
-from bs4 import BeautifulSoup, NavigableString
+
+from .changes import NO_CHANGES, NO_SECTION_CHANGES, ChangeSet, diff_records
+from .const import (
+    COALESCE_TTL,
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_HEDGE_REQUESTS,
+    DEFAULT_READ_TIMEOUT,
+    DEFAULT_STREAM_PAGES,
+    DEFAULT_UPDATE_TIMEOUT,
+    DISCOVERY_CACHE_TTL,
+    HEDGE_MIN_SAMPLES,
+    HEDGE_PERCENTILE,
+    MAX_CONCURRENT_PARSES,
+    PARSE_EXECUTOR_PROCESS,
+    PARSE_EXECUTOR_THREAD,
+)
+from .metrics import ScraperMetrics
+from .models import ForecastSlot, LiveObservation
+from .parsing import (
+    ParsedPage,
+    SectionScanner,
+    extract_live,
+    get_parser,
+    section_hash,
+)
+
+if TYPE_CHECKING:
+    from .fetcher import MeteoGrFetcher
 
 _LOGGER = logging.getLogger(__name__)
 
+# Shared by every scraper so the number of parses in flight stays bounded
+# no matter how many config entries are set up.
+_PARSE_SEMAPHORE = asyncio.Semaphore(MAX_CONCURRENT_PARSES)
+_process_pool: ProcessPoolExecutor | None = None
+
+# aiohttp can only decode brotli when one of these packages is installed
+ACCEPT_ENCODING = (
+    "gzip, deflate, br"
+    if find_spec("brotli") or find_spec("brotlicffi")
+    else "gzip, deflate"
+)
+
+# Station names found per city, with the monotonic time they were found
+_discovered_stations: dict[int, tuple[float, list[str]]] = {}
+
+# Returned by the fetch when the page is the same as the last parsed one
+_NOT_MODIFIED = object()
+
+
+class _Validators(NamedTuple):
+    """What identifies a fetched version of the page."""
+
+    etag: str | None
+    last_modified: str | None
+    content_hash: bytes
+
+
+class _Response(NamedTuple):
+    """A response of meteo.gr, which the scrapers of its city share."""
+
+    # Validators the request was conditional on
+    sent: _Validators | None
+    # None when the page was not modified since the sent validators
+    html: str | None
+    validators: _Validators | None
+    # The page parsed while it was streamed, with the key of the parse
+    parsed: tuple[Hashable, ParsedPage] | None = None
+
+
+# Recent responses per city, with the monotonic time they were received
+_recent_responses: dict[int, tuple[float, _Response]] = {}
+# Fetches and parses in progress, awaited by every caller asking for the same
+_in_flight: dict[Hashable, asyncio.Future] = {}
+
+
+async def _single_flight(key: Hashable, factory: Callable[[], Awaitable]):
+    """Run a coroutine once for all concurrent callers of the same key.
+
+    The shared task is shielded, so that a caller giving up does not cancel
+    it for the others.
+    """
+    if (task := _in_flight.get(key)) is None:
+        task = _in_flight[key] = asyncio.ensure_future(factory())
+        task.add_done_callback(lambda _: _in_flight.pop(key, None))
+    return await asyncio.shield(task)
+
+
+def _get_parse_executor(kind: str) -> Executor | None:
+    """Return the executor to parse with, None meaning the loop's default."""
+    global _process_pool
+    if kind != PARSE_EXECUTOR_PROCESS:
+        return None
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor(
+            max_workers=MAX_CONCURRENT_PARSES,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _process_pool
+
+
+def shutdown_parse_pool() -> None:
+    """Shut down the shared parse process pool, if one was started."""
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=False, cancel_futures=True)
+        _process_pool = None
+
+
+def _parse_html(
+    html: str,
+    parser_backend: str | None,
+    live_hash: bytes | None,
+    forecast_hash: bytes | None,
+    include_forecast: bool,
+) -> ParsedPage:
+    """Parse the changed sections of a page.
+
+    Runs in an executor, so it must stay a module level function.
+    """
+    return get_parser(parser_backend).parse_page(
+        html, live_hash, forecast_hash, include_forecast
+    )
+
+
+def _parse_section(
+    markup: str, parser_backend: str | None, forecast: bool
+) -> tuple[list[LiveObservation] | list[ForecastSlot], float]:
+    """Parse the live block or forecast tables, timing the parse.
+
+    Runs in an executor, so it must stay a module level function.
+    """
+    start = time.perf_counter()
+    parser = get_parser(parser_backend)
+    records = parser.parse_forecast(markup) if forecast else parser.parse_live(markup)
+    return records, time.perf_counter() - start
+
+
+def _parse_station_names(html: str, parser_backend: str | None) -> list[str]:
+    """Parse the names of the live stations of a page."""
+    return get_parser(parser_backend).parse_station_names(extract_live(html))
+
 
 class MeteoGrScraper:
     """A class to fetch and parse weather data from meteo.gr."""
 
     BASE_URL = "https://meteo.gr/cf-en.cfm?city_id={city_id}"
 
-    def __init__(self, session: aiohttp.ClientSession, city_id: int) -> None:
-        """Initialize the scraper."""
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        city_id: int,
+        parse_executor: str = PARSE_EXECUTOR_THREAD,
+        parser_backend: str | None = None,
+        fetcher: "MeteoGrFetcher | None" = None,
+    ) -> None:
+        """Initialize the scraper.
+
+        With a fetcher, requests are throttled together with those of the
+        other cities using it.
+        """
         self.session = session
+        self.fetcher = fetcher
+        self.timeout = aiohttp.ClientTimeout(
+            sock_connect=DEFAULT_CONNECT_TIMEOUT, sock_read=DEFAULT_READ_TIMEOUT
+        )
+        # Deadline of a whole update, fetch and parse, in seconds
+        self.update_timeout: float = DEFAULT_UPDATE_TIMEOUT
+        self.hedge = DEFAULT_HEDGE_REQUESTS
+        # Whether to read only the sections of the page, as they arrive
+        self.streaming = DEFAULT_STREAM_PAGES
+        # Whether streaming stops reading at the footer following the
+        # sections, dropping the connection. Off until recorded pages show
+        # that meteo.gr pages have such a footer.
+        self.stop_early = False
+        self.metrics = ScraperMetrics()
         self.city_id = city_id
+        self.parse_executor = parse_executor
+        self.parser_backend = get_parser(parser_backend).name
         self.url = self.BASE_URL.format(city_id=self.city_id)
         self.headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.36"
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.36",
+            "Accept-Encoding": ACCEPT_ENCODING,
         }
-        self.live_stations = []
-        self.forecast = []
+        self.live_stations: list[LiveObservation] = []
+        self.forecast: list[ForecastSlot] = []
+        # Hashes of the markup of the live block and of the forecast tables
+        self.live_hash: bytes | None = None
+        self.forecast_hash: bytes | None = None
+        # What the latest update changed in the live stations and forecast
+        self.changes = NO_CHANGES
+        # Whether a page was parsed without looking at its forecast
+        self._forecast_pending = False
+        # Validators of the page the current data was parsed from
+        self._validators: _Validators | None = None
+
+    def _parse_key(self, include_forecast: bool) -> tuple:
+        """Return what a parse of a page depends on besides the page."""
+        return (
+            self.live_hash,
+            self.forecast_hash,
+            include_forecast,
+            self.parser_backend,
+        )
+
+    async def _send(
+        self,
+        sent: _Validators | None,
+        holding: asyncio.Event | None = None,
+        include_forecast: bool = False,
+    ) -> _Response:
+        """Send one request for the page, recording how long it took.
+
+        The holding event is set once the request got its slot from the
+        fetcher and is about to be sent. A streamed page is parsed as it
+        arrives, with the forecast only when included.
+        """
+        headers = self.headers
+        if sent is not None:
+            headers = dict(headers)
+            if sent.etag:
+                headers["If-None-Match"] = sent.etag
+            if sent.last_modified:
+                headers["If-Modified-Since"] = sent.last_modified
+        async with self.fetcher.throttle() if self.fetcher else nullcontext():
+            # Waiting on the throttle does not count as latency
+            start = time.monotonic()
+            if holding is not None:
+                holding.set()
+            async with self.session.get(
+                self.url, headers=headers, timeout=self.timeout
+            ) as response:
+                if response.status == HTTPStatus.NOT_MODIFIED:
+                    result = _Response(sent, None, None)
+                else:
+                    response.raise_for_status()
+                    parsed = None
+                    if self.streaming:
+                        html, parsed = await self._read_sections(
+                            response, include_forecast
+                        )
+                        body = html.encode()
+                    else:
+                        body = await response.read()
+                        self.metrics.response_size.add(len(body))
+                        html = body.decode(response.get_encoding())
+                    validators = _Validators(
+                        response.headers.get("ETag"),
+                        response.headers.get("Last-Modified"),
+                        hashlib.blake2b(body, digest_size=16).digest(),
+                    )
+                    result = _Response(sent, html, validators, parsed)
+        latency = time.monotonic() - start
+        self.metrics.fetch_latency.add(latency)
+        if result.html is not None:
+            self.metrics.page_latency.add(latency)
+        return result
+
+    async def _async_parse_section(self, markup: str, forecast: bool):
+        """Parse a section of the page in an executor."""
+        loop = asyncio.get_running_loop()
+        async with _PARSE_SEMAPHORE:
+            return await loop.run_in_executor(
+                _get_parse_executor(self.parse_executor),
+                _parse_section,
+                markup,
+                self.parser_backend,
+                forecast,
+            )
+
+    async def _read_sections(
+        self, response: aiohttp.ClientResponse, include_forecast: bool
+    ) -> tuple[str, tuple[Hashable, ParsedPage]]:
+        """Read the sections of the page, parsing each one as it arrives.
+
+        The body is scanned chunk by chunk while it downloads. The live block
+        and every forecast table go to the executor as soon as they are
+        closed, so they are parsed while the rest of the page is still on
+        its way. As with parse_page, an unchanged live block is not parsed
+        and the forecast only when included. Returns the markup of the
+        sections, and the page parsed from them with the key of the parse.
+        """
+        key = self._parse_key(include_forecast)
+        scanner = SectionScanner()
+        decoder = codecs.getincrementaldecoder(response.charset or "utf-8")()
+        size = 0
+        live_hash: bytes | None = None
+        live_task: asyncio.Future | None = None
+        table_tasks: list[asyncio.Future] = []
+
+        def parse_closed(final: bool = False) -> None:
+            nonlocal live_hash, live_task
+            if live_hash is None and (final or scanner.live is not None):
+                live_hash = section_hash(scanner.live or "")
+                if live_hash != self.live_hash:
+                    live_task = asyncio.ensure_future(
+                        self._async_parse_section(scanner.live or "", False)
+                    )
+            if include_forecast:
+                table_tasks.extend(
+                    asyncio.ensure_future(self._async_parse_section(table, True))
+                    for table in scanner.tables[len(table_tasks) :]
+                )
 
-    async def _fetch_soup(self):
-        """Fetch content and return a BeautifulSoup object."""
         try:
-            async with self.session.get(self.url, headers=self.headers) as response:
-                response.raise_for_status()
-                html = await response.text()
-                return BeautifulSoup(html, "html.parser")
+            async for chunk in response.content.iter_any():
+                size += len(chunk)
+                complete = scanner.feed(decoder.decode(chunk))
+                parse_closed()
+                if complete and self.stop_early:
+                    # Drops the connection instead of reading the rest
+                    response.close()
+                    self.metrics.stopped_early += 1
+                    break
+            else:
+                scanner.feed(decoder.decode(b"", final=True))
+            markup = scanner.markup()
+            parse_closed(final=True)
+            self.metrics.response_size.add(size)
+
+            live = live_seconds = None
+            if live_task is not None:
+                live, live_seconds = await live_task
+            forecast = forecast_hash = forecast_seconds = None
+            if include_forecast:
+                forecast_hash = section_hash("".join(scanner.tables))
+                tables = await asyncio.gather(*table_tasks)
+                # Parsed before its hash was known, but only used if changed
+                if forecast_hash != self.forecast_hash:
+                    forecast = [slot for slots, _ in tables for slot in slots]
+                    forecast_seconds = sum(seconds for _, seconds in tables)
+        finally:
+            for task in (live_task, *table_tasks):
+                if task is not None:
+                    task.cancel()
+
+        page = ParsedPage(
+            live, forecast, live_hash, forecast_hash, live_seconds, forecast_seconds
+        )
+        return markup, (key, page)
+
+    def _hedge_delay(self) -> float | None:
+        """Return after how many seconds to send a hedged request, if at all."""
+        # Compared with full responses only, as 304s are much quicker
+        if not self.hedge or len(self.metrics.page_latency) < HEDGE_MIN_SAMPLES:
+            return None
+        return self.metrics.page_latency.percentile(HEDGE_PERCENTILE)
+
+    async def _send_hedged(
+        self, sent: _Validators | None, include_forecast: bool = False
+    ) -> _Response:
+        """Send a request, and a second one if the first is unusually slow.
+
+        Whichever succeeds first is used and the other one is cancelled.
+        """
+        holding = asyncio.Event()
+        first = asyncio.ensure_future(self._send(sent, holding, include_forecast))
+        if (delay := self._hedge_delay()) is None:
+            return await first
+        # The delay only runs once the request is sent, not while throttled
+        sending = asyncio.ensure_future(holding.wait())
+        try:
+            await asyncio.wait({first, sending}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            sending.cancel()
+        if first.done():
+            return first.result()
+        done, _ = await asyncio.wait({first}, timeout=delay)
+        if done:
+            return first.result()
+
+        _LOGGER.debug(
+            "Request for city %s is taking over %.1f s, hedging it",
+            self.city_id,
+            delay,
+        )
+        self.metrics.hedged += 1
+        pending = {
+            first,
+            asyncio.ensure_future(
+                self._send(sent, include_forecast=include_forecast)
+            ),
+        }
+        try:
+            while True:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                if not pending:
+                    # Both failed
+                    return done.pop().result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _request(
+        self, sent: _Validators | None, include_forecast: bool = False
+    ) -> _Response | None:
+        """Request the page, conditionally on the given validators."""
+        try:
+            result = await self._send_hedged(sent, include_forecast)
+        except TimeoutError:
+            _LOGGER.error("Timeout fetching data from meteo.gr")
+            self.metrics.timeouts += 1
+            return None
         except aiohttp.ClientError as err:
             _LOGGER.error("Error fetching data from meteo.gr: %s", err)
             return None
 
-    def _clean_value(self, value, value_type=int):
-        """Extract a number from a string and convert it."""
-        if value is None:
-            return None
-        match = re.search(r"[-+]?\d*\.\d+|[-+]?\d+", str(value))
-        if match:
-            try:
-                return value_type(float(match.group()))
-            except (ValueError, TypeError):
+        now = time.monotonic()
+        for city_id, (received, _) in list(_recent_responses.items()):
+            if now - received >= COALESCE_TTL:
+                del _recent_responses[city_id]
+        _recent_responses[self.city_id] = (now, result)
+        return result
+
+    async def _fetch_html(
+        self, conditional: bool = True, include_forecast: bool = False
+    ):
+        """Fetch the page content, its validators and the page parsed if streamed.
+
+        Returns _NOT_MODIFIED when the page has not changed since the last
+        parse, either as told by the server or by the hash of its content,
+        unless the fetch is unconditional.
+
+        Concurrent fetches of a city share one request, and its response is
+        reused for a few seconds by any fetch it answers.
+        """
+        sent = self._validators if conditional else None
+        cached = _recent_responses.get(self.city_id)
+        if (
+            cached is not None
+            and time.monotonic() - cached[0] < COALESCE_TTL
+            and (cached[1].html is not None or cached[1].sent == sent)
+        ):
+            response = cached[1]
+            self.metrics.coalesced += 1
+        else:
+            key = ("fetch", self.city_id, sent)
+            if key in _in_flight:
+                self.metrics.coalesced += 1
+            else:
+                self.metrics.requests += 1
+            response = await _single_flight(
+                key, lambda: self._request(sent, include_forecast)
+            )
+            if response is None:
                 return None
-        return None
 
-    def _parse_live_stations(self, soup: BeautifulSoup):
-        """Parse live station data."""
-        live_container = soup.find("div", id="live")
-        if not live_container:
-            return []
-
-        station_names_divs = live_container.select(".nowHead2")
-        station_panels = live_container.select(".nowpanel")
-
-        stations_data = []
-        for name_div, panel_div in zip(station_names_divs, station_panels, strict=False):
-            if name_div is None:
-                continue
-            try:
-                station_name = name_div.find(string=True, recursive=False).strip()
-                temp_tag = panel_div.select_one(".nowtemp")
-                humid_tags = panel_div.find_all("div", {"class": "humid"})
-                if humid_tags is None:
-                    continue
-                temperature = None
-                if temp_tag:
-                    temperature = temp_tag.get_text()
-                humidity = None
-                if len(humid_tags) > 0:
-                    if len(humid_tags[0].contents) > 1:
-                        humidity = humid_tags[0].contents[1]
-                pressure = None
-                if len(humid_tags) > 1:
-                    if len(humid_tags[1].contents) > 1:
-                        pressure = humid_tags[1].contents[1]
-                wind_kmh = None
-                if panel_div.select_one(".windnumber"):
-                    wind_kmh = panel_div.select_one(".windnumber").get_text()
-                wind_bf = None
-                if panel_div.select_one(".nowbeaufort"):
-                    wind_bf = panel_div.select_one(".nowbeaufort").get_text()
-                wind_dir = None
-                if panel_div.select_one(".winddirection"):
-                    wind_dir = panel_div.select_one(".winddirection").get_text(strip=True)
-                stations_data.append(
-                    {
-                        "name": station_name,
-                        "temperature": self._clean_value(temperature, float),
-                        "humidity": self._clean_value(humidity,int),
-                        "pressure": self._clean_value(pressure, float),
-                        "wind_kmh": self._clean_value(wind_kmh, float),
-                        "wind_bf": self._clean_value(wind_bf, int),
-                        "wind_dir": wind_dir,
-                    }
+        if response.html is None:
+            self.metrics.not_modified += 1
+            return _NOT_MODIFIED
+        if (
+            conditional
+            and self._validators is not None
+            and self._validators.content_hash == response.validators.content_hash
+        ):
+            self._validators = response.validators
+            self.metrics.unchanged += 1
+            return _NOT_MODIFIED
+        return response.html, response.validators, response.parsed
+
+    async def _async_parse(self, html: str, include_forecast: bool) -> ParsedPage:
+        """Parse the page in an executor, keeping the event loop free."""
+        loop = asyncio.get_running_loop()
+        async with _PARSE_SEMAPHORE:
+            return await loop.run_in_executor(
+                _get_parse_executor(self.parse_executor),
+                _parse_html,
+                html,
+                self.parser_backend,
+                self.live_hash,
+                self.forecast_hash,
+                include_forecast,
+            )
+
+    async def discover_stations(self) -> list[str] | None:
+        """Return the names of the live stations of the city.
+
+        Only the station headings are parsed, and the names are reused for a
+        while, so that adding several stations of a city fetches its page
+        once. Returns None when the page cannot be fetched.
+        """
+        now = time.monotonic()
+        cached = _discovered_stations.get(self.city_id)
+        if cached is not None and now - cached[0] < DISCOVERY_CACHE_TTL:
+            return cached[1]
+
+        result = await self._fetch_html(conditional=False)
+        if result is None:
+            return None
+        html, validators, _ = result
+
+        async def parse() -> list[str]:
+            loop = asyncio.get_running_loop()
+            async with _PARSE_SEMAPHORE:
+                return await loop.run_in_executor(
+                    None, _parse_station_names, html, self.parser_backend
                 )
-            except (AttributeError, IndexError) as e:
-                _LOGGER.warning("Skipping a station due to parsing error: %s", e)
-                continue
-        return stations_data
-
-    def _parse_forecast(self, soup: BeautifulSoup):
-        # Remove Dust
-        elements = soup.find_all("div", id="dust")
-        for element in elements:
-            element.decompose()
-
-        stations_data = []
-        day = ""
-        month = ""
-        time = ""
-        temperature = ""
-        humidity = ""
-        wind_kmh = ""
-        wind_dir = ""
-        wind_bf = ""
-        prediction = ""
-        month_map = {
-            name: num
-            for num, name in enumerate(
-                [
-                    "January",
-                    "February",
-                    "March",
-                    "April",
-                    "May",
-                    "June",
-                    "July",
-                    "August",
-                    "September",
-                    "October",
-                    "November",
-                    "December",
-                ],
-                1,
+
+        names = await _single_flight(
+            ("stations", self.city_id, validators.content_hash), parse
+        )
+        _discovered_stations[self.city_id] = (now, names)
+        return names
+
+    async def fetch_page(self) -> str | None:
+        """Fetch the page with a request of its own, for profiling.
+
+        No recent or concurrent response is reused and the data is left
+        alone. Returns None when the page cannot be fetched.
+        """
+        response = await self._request(None)
+        return None if response is None else response.html
+
+    def parse_page(self, html: str) -> ParsedPage:
+        """Parse every section of a page in the calling thread, for profiling.
+
+        Unlike updates, this blocks and never skips an unchanged section.
+        """
+        return _parse_html(html, self.parser_backend, None, None, True)
+
+    async def update(self, forecast: bool = True):
+        """Fetch and parse all data, or only the live stations.
+
+        Only the sections whose markup changed are parsed. Without the
+        forecast, the forecast tables are skipped altogether and looked at
+        on the next update including it. Fails when it takes longer than
+        the update timeout.
+        """
+        try:
+            async with asyncio.timeout(self.update_timeout):
+                success = await self._update(forecast)
+        except TimeoutError:
+            _LOGGER.error(
+                "Updating city %s took longer than %s seconds",
+                self.city_id,
+                self.update_timeout,
             )
-        }
-        for prognosis in soup.select("table[id^=outerTable]:not(.hidden-xs)"):
-            for table in prognosis.find_all("tr"):
-                day_find = table.find("td", {"class": "forecastDate"})
-                if day_find is not None:
-                    day = int(
-                        day_find.find("span", {"class": "dayNumbercf"})
-                        .contents[0]
-                        .strip()
-                    )
-                    month = month_map.get(
-                        day_find.find("span", {"class": "monthNumbercf"})
-                        .get_text()
-                        .strip()
-                    )
-                    today = date.today()
-                    current_year = today.year
-                    forecast_year = (
-                        current_year + 1 if month < today.month else current_year
-                    )
+            self.metrics.timeouts += 1
+            success = False
+        if not success:
+            self.metrics.failures += 1
+        return success
 
-                if "perhour" in str(table.get("class")):
-                    try:
-                        time = table.find("table").get_text().strip()
-                        hour, minute = map(int, time.split(":"))
-                        forecast_datetime = datetime(
-                            forecast_year, month, day, hour, minute
-                        )
-                    except:
-                        continue
-                    humidity_find = table.find("td", {"class": "humidity"})
-                    temperature_find = table.find("td", {"class": "temperature"})
-                    wind_find = table.find("td", {"class": "anemosfull"})
-                    prediction_find = table.find("td", {"class": "phenomeno-name"})
-                    if temperature_find is not None and len(temperature_find.contents) > 0:
-                        if isinstance(temperature_find.contents[0], NavigableString):
-                            temperature = temperature_find.contents[0].strip()
-                        if len(temperature_find.contents) > 1 and isinstance(temperature_find.contents[1], NavigableString):
-                            temperature = temperature_find.contents[1].strip()
-                    if humidity_find is not None and len(humidity_find.contents) > 0:
-                        humidity = humidity_find.contents[0].strip()
-                    if wind_find is not None:
-                        wind_bf = "0"
-                        wind_dir = ""
-                        wind_kmh = "0"
-                        if wind_find.td.span is not None:
-                            if len(wind_find.td.span.contents) > 0:
-                                wind_kmh, _ = wind_find.td.span.contents[0].strip().split()
-                            wind_bf, _, wind_dir = (
-                                wind_find.td.contents[0].strip().split()
-                            )
-                    prediction_find = table.find("td", {"class": "phenomeno-name"})
-                    if prediction_find is not None:
-                        prediction = ""
-                        if len(prediction_find.contents) > 0:
-                            prediction = prediction_find.contents[0].strip()
-                        stations_data.append(
-                            {
-                                "datetime": forecast_datetime.isoformat(),
-                                "temperature": self._clean_value(temperature),
-                                "humidity": self._clean_value(humidity),
-                                "wind_kmh": self._clean_value(wind_kmh),
-                                "wind_bf": self._clean_value(wind_bf),
-                                "wind_dir": wind_dir,
-                                "prediction": prediction,
-                            }
-                        )
-        return stations_data
-
-    async def update(self):
-        """Fetch and parse all data."""
-        soup = await self._fetch_soup()
-        if soup:
-            self.live_stations = self._parse_live_stations(soup)
-            self.forecast = self._parse_forecast(soup)
-            return True
-        return False
+    def replace_data(
+        self,
+        live: list[LiveObservation] | None,
+        forecast: list[ForecastSlot] | None,
+    ) -> None:
+        """Take parsed live stations and forecast, None for those not parsed.
+
+        They are diffed against the current ones, whose unchanged records
+        are kept so they stay the same objects, and the changes are kept.
+        """
+        live_changes = forecast_changes = NO_SECTION_CHANGES
+        if live is not None:
+            self.live_stations, live_changes = diff_records(
+                self.live_stations, live, attrgetter("name")
+            )
+        if forecast is not None:
+            self.forecast, forecast_changes = diff_records(
+                self.forecast, forecast, attrgetter("datetime")
+            )
+        self.changes = ChangeSet(live_changes, forecast_changes)
+
+    async def _update(self, forecast: bool) -> bool:
+        """Fetch and parse all data, or only the live stations."""
+        self.changes = NO_CHANGES
+        # An unchanged page may still hold a forecast that was never looked at
+        result = await self._fetch_html(
+            conditional=not (forecast and self._forecast_pending),
+            include_forecast=forecast,
+        )
+        if result is None:
+            return False
+        if result is not _NOT_MODIFIED:
+            html, validators, parsed = result
+            key = self._parse_key(forecast)
+            if parsed is not None and parsed[0] == key:
+                # Parsed while the page was streamed
+                page = parsed[1]
+            else:
+                # Scrapers of the same city and state share the parse
+                page = await _single_flight(
+                    ("parse", self.city_id, validators.content_hash, *key),
+                    lambda: self._async_parse(html, forecast),
+                )
+            if page.live_seconds is not None:
+                self.metrics.parse_live.add(page.live_seconds)
+            if page.forecast_seconds is not None:
+                self.metrics.parse_forecast.add(page.forecast_seconds)
+            self.replace_data(page.live, page.forecast if forecast else None)
+            self.live_hash = page.live_hash
+            if forecast:
+                self.forecast_hash = page.forecast_hash
+            self._forecast_pending = not forecast
+            # Only remembered once parsed, so a failed parse is retried
+            self._validators = validators
+        self.metrics.stations.add(len(self.live_stations))
+        self.metrics.forecast_rows.add(len(self.forecast))
+        return True
 
 # if __name__ == "__main__":
 #     import asyncio
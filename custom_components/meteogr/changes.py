@@ -0,0 +1,87 @@
+"""Changes between consecutive parses of a city."""
+
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+from typing import TypeVar
+
+Record = TypeVar("Record")
+
+
+@dataclass(frozen=True, slots=True)
+class SectionChanges:
+    """Keys of the records of a section added, removed or modified."""
+
+    added: frozenset = frozenset()
+    removed: frozenset = frozenset()
+    modified: frozenset = frozenset()
+
+    def __bool__(self) -> bool:
+        """Return whether anything changed."""
+        return bool(self.added or self.removed or self.modified)
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Return whether the record of a key changed in any way."""
+        return key in self.added or key in self.removed or key in self.modified
+
+    def as_dict(self) -> dict[str, int]:
+        """Return how many records changed in each way, for diagnostics."""
+        return {
+            "added": len(self.added),
+            "removed": len(self.removed),
+            "modified": len(self.modified),
+        }
+
+
+NO_SECTION_CHANGES = SectionChanges()
+
+
+@dataclass(frozen=True, slots=True)
+class ChangeSet:
+    """What an update changed, per live station name and forecast time."""
+
+    live: SectionChanges = NO_SECTION_CHANGES
+    forecast: SectionChanges = NO_SECTION_CHANGES
+
+    def __bool__(self) -> bool:
+        """Return whether anything changed."""
+        return bool(self.live or self.forecast)
+
+
+NO_CHANGES = ChangeSet()
+
+
+def diff_records(
+    previous: list[Record],
+    current: list[Record],
+    key: Callable[[Record], Hashable],
+) -> tuple[list[Record], SectionChanges]:
+    """Return the records of a new parse and how they changed.
+
+    Records equal to the previous ones of their key are replaced by those,
+    so unchanged records keep their identity from parse to parse. When
+    nothing changed at all, the previous list itself is returned.
+    """
+    before = {key(record): record for record in previous}
+    records = []
+    added = []
+    modified = []
+    for record in current:
+        record_key = key(record)
+        if (old := before.pop(record_key, None)) is None:
+            added.append(record_key)
+        elif old == record:
+            record = old
+        else:
+            modified.append(record_key)
+        records.append(record)
+
+    if not (added or modified or before):
+        if len(records) == len(previous) and all(
+            new is old for new, old in zip(records, previous)
+        ):
+            return previous, NO_SECTION_CHANGES
+        # Only reordered, no record changed
+        return records, NO_SECTION_CHANGES
+    return records, SectionChanges(
+        frozenset(added), frozenset(before), frozenset(modified)
+    )
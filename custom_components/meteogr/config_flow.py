@@ -10,11 +10,40 @@ from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
 from .api import MeteoGrScraper
 from .const import (
+    CONF_ADAPTIVE_INTERVAL,
     CONF_CITY_ID,
+    CONF_CONNECT_TIMEOUT,
+    CONF_DIAGNOSTIC_SENSORS,
+    CONF_FORECAST_INTERVAL,
+    CONF_FORECAST_STEP,
+    CONF_HEDGE_REQUESTS,
+    CONF_MAX_INTERVAL,
+    CONF_MAX_STALENESS,
+    CONF_MIN_INTERVAL,
+    CONF_PARSE_EXECUTOR,
+    CONF_READ_TIMEOUT,
+    CONF_STALE_GRACE,
     CONF_STATION_NAME,
+    CONF_STREAM_PAGES,
     CONF_UPDATE_INTERVAL,  # ADDED
+    CONF_UPDATE_TIMEOUT,
+    DEFAULT_ADAPTIVE_INTERVAL,
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_DIAGNOSTIC_SENSORS,
+    DEFAULT_FORECAST_INTERVAL,
+    DEFAULT_FORECAST_STEP,
+    DEFAULT_HEDGE_REQUESTS,
+    DEFAULT_MAX_INTERVAL,
+    DEFAULT_MAX_STALENESS,
+    DEFAULT_MIN_INTERVAL,
+    DEFAULT_PARSE_EXECUTOR,
+    DEFAULT_READ_TIMEOUT,
+    DEFAULT_STALE_GRACE,
+    DEFAULT_STREAM_PAGES,
     DEFAULT_UPDATE_INTERVAL,  # ADDED
+    DEFAULT_UPDATE_TIMEOUT,
     DOMAIN,
+    PARSE_EXECUTORS,
 )
 
 
@@ -34,12 +63,96 @@ class MeteoGrOptionsFlowHandler(config_entries.OptionsFlow):
         current_interval = self.config_entry.options.get(
             CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL
         )
+        current_forecast_interval = self.config_entry.options.get(
+            CONF_FORECAST_INTERVAL, DEFAULT_FORECAST_INTERVAL
+        )
+        current_executor = self.config_entry.options.get(
+            CONF_PARSE_EXECUTOR, DEFAULT_PARSE_EXECUTOR
+        )
+        current_staleness = self.config_entry.options.get(
+            CONF_MAX_STALENESS, DEFAULT_MAX_STALENESS
+        )
+        current_grace = self.config_entry.options.get(
+            CONF_STALE_GRACE, DEFAULT_STALE_GRACE
+        )
+        current_adaptive = self.config_entry.options.get(
+            CONF_ADAPTIVE_INTERVAL, DEFAULT_ADAPTIVE_INTERVAL
+        )
+        current_min = self.config_entry.options.get(
+            CONF_MIN_INTERVAL, DEFAULT_MIN_INTERVAL
+        )
+        current_max = self.config_entry.options.get(
+            CONF_MAX_INTERVAL, DEFAULT_MAX_INTERVAL
+        )
+        current_connect_timeout = self.config_entry.options.get(
+            CONF_CONNECT_TIMEOUT, DEFAULT_CONNECT_TIMEOUT
+        )
+        current_read_timeout = self.config_entry.options.get(
+            CONF_READ_TIMEOUT, DEFAULT_READ_TIMEOUT
+        )
+        current_update_timeout = self.config_entry.options.get(
+            CONF_UPDATE_TIMEOUT, DEFAULT_UPDATE_TIMEOUT
+        )
+        current_hedge = self.config_entry.options.get(
+            CONF_HEDGE_REQUESTS, DEFAULT_HEDGE_REQUESTS
+        )
+        current_diagnostic_sensors = self.config_entry.options.get(
+            CONF_DIAGNOSTIC_SENSORS, DEFAULT_DIAGNOSTIC_SENSORS
+        )
+        current_forecast_step = self.config_entry.options.get(
+            CONF_FORECAST_STEP, DEFAULT_FORECAST_STEP
+        )
+        current_stream_pages = self.config_entry.options.get(
+            CONF_STREAM_PAGES, DEFAULT_STREAM_PAGES
+        )
 
         return self.async_show_form(
             step_id="init",
             data_schema=vol.Schema(
                 {
-                    vol.Required(CONF_UPDATE_INTERVAL, default=current_interval): int,
+                    vol.Required(
+                        CONF_UPDATE_INTERVAL, default=current_interval
+                    ): vol.All(int, vol.Range(min=1)),
+                    vol.Required(
+                        CONF_FORECAST_INTERVAL, default=current_forecast_interval
+                    ): vol.All(int, vol.Range(min=1)),
+                    vol.Required(
+                        CONF_PARSE_EXECUTOR, default=current_executor
+                    ): vol.In(PARSE_EXECUTORS),
+                    vol.Required(
+                        CONF_MAX_STALENESS, default=current_staleness
+                    ): vol.All(int, vol.Range(min=0)),
+                    vol.Required(CONF_STALE_GRACE, default=current_grace): vol.All(
+                        int, vol.Range(min=0)
+                    ),
+                    vol.Required(
+                        CONF_ADAPTIVE_INTERVAL, default=current_adaptive
+                    ): bool,
+                    vol.Required(CONF_MIN_INTERVAL, default=current_min): vol.All(
+                        int, vol.Range(min=1)
+                    ),
+                    vol.Required(CONF_MAX_INTERVAL, default=current_max): vol.All(
+                        int, vol.Range(min=1)
+                    ),
+                    vol.Required(
+                        CONF_CONNECT_TIMEOUT, default=current_connect_timeout
+                    ): vol.All(int, vol.Range(min=1)),
+                    vol.Required(
+                        CONF_READ_TIMEOUT, default=current_read_timeout
+                    ): vol.All(int, vol.Range(min=1)),
+                    vol.Required(
+                        CONF_UPDATE_TIMEOUT, default=current_update_timeout
+                    ): vol.All(int, vol.Range(min=1)),
+                    vol.Required(CONF_HEDGE_REQUESTS, default=current_hedge): bool,
+                    vol.Required(
+                        CONF_DIAGNOSTIC_SENSORS, default=current_diagnostic_sensors
+                    ): bool,
+                    vol.Required(
+                        CONF_FORECAST_STEP, default=current_forecast_step
+                    ): vol.All(int, vol.Range(min=0, max=180)),
+                    vol.Required(
+                        CONF_STREAM_PAGES, default=current_stream_pages
+                    ): bool,
                 }
             ),
         )
@@ -71,9 +184,9 @@ class MeteoGrConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             session = async_get_clientsession(self.hass)
 
             api = MeteoGrScraper(session, city_id)
-            if await api.update() and api.live_stations:
+            if stations := await api.discover_stations():
                 self.data[CONF_CITY_ID] = city_id
-                self.stations = [station["name"] for station in api.live_stations]
+                self.stations = stations
                 return await self.async_step_station()
 
             errors["base"] = "cannot_connect"
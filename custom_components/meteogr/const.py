@@ -2,13 +2,77 @@
 
 DOMAIN = "meteogr"
 
+# hass.data key of the coordinators shared by the entries of each city
+DATA_CITY_COORDINATORS = f"{DOMAIN}_city_coordinators"
+DATA_FETCHER = f"{DOMAIN}_fetcher"
+
+# Sent with the city ID after every update attempt of the city
+SIGNAL_METRICS_UPDATED = f"{DOMAIN}_metrics_updated_{{}}"
+
 # Configuration constants
 CONF_CITY_ID = "city_id"
 CONF_STATION_NAME = "station_name"
 CONF_UPDATE_INTERVAL = "update_interval"
+CONF_FORECAST_INTERVAL = "forecast_interval"
+CONF_PARSE_EXECUTOR = "parse_executor"
+CONF_MAX_STALENESS = "max_staleness"
+CONF_STALE_GRACE = "stale_grace"
+CONF_ADAPTIVE_INTERVAL = "adaptive_interval"
+CONF_MIN_INTERVAL = "min_interval"
+CONF_MAX_INTERVAL = "max_interval"
+CONF_CONNECT_TIMEOUT = "connect_timeout"
+CONF_READ_TIMEOUT = "read_timeout"
+CONF_UPDATE_TIMEOUT = "update_timeout"
+CONF_HEDGE_REQUESTS = "hedge_requests"
+CONF_DIAGNOSTIC_SENSORS = "diagnostic_sensors"
+CONF_FORECAST_STEP = "forecast_step"
+CONF_STREAM_PAGES = "stream_pages"
+
+# Parse executors
+PARSE_EXECUTOR_THREAD = "thread"
+PARSE_EXECUTOR_PROCESS = "process"
+PARSE_EXECUTORS = [PARSE_EXECUTOR_THREAD, PARSE_EXECUTOR_PROCESS]
 
 # Defaults
 DEFAULT_UPDATE_INTERVAL = 60  # minutes
+DEFAULT_FORECAST_INTERVAL = 120  # minutes
+DEFAULT_PARSE_EXECUTOR = PARSE_EXECUTOR_THREAD
+DEFAULT_MAX_STALENESS = 180  # minutes
+DEFAULT_STALE_GRACE = 120  # minutes
+DEFAULT_ADAPTIVE_INTERVAL = False
+DEFAULT_MIN_INTERVAL = 10  # minutes
+DEFAULT_MAX_INTERVAL = 180  # minutes
+DEFAULT_CONNECT_TIMEOUT = 10  # seconds
+DEFAULT_READ_TIMEOUT = 20  # seconds
+DEFAULT_UPDATE_TIMEOUT = 60  # seconds
+DEFAULT_HEDGE_REQUESTS = False
+DEFAULT_DIAGNOSTIC_SENSORS = False
+DEFAULT_FORECAST_STEP = 0  # minutes, 0 following the forecast of meteo.gr
+DEFAULT_STREAM_PAGES = False
+
+# First retry delay after a failed update, doubled on every further failure
+RETRY_INITIAL_DELAY = 30  # seconds
+
+# Upper bound of pages parsed at the same time across all config entries
+MAX_CONCURRENT_PARSES = 2
+
+# Requests to meteo.gr across all cities: at most this many at once, and
+# on average no more per second than the rate, with bursts of a few
+MAX_CONCURRENT_FETCHES = 4
+FETCH_RATE = 1.0  # requests per second
+FETCH_BURST = 4
+FETCH_KEEPALIVE_TIMEOUT = 60  # seconds
+
+# A hedged request is sent once the first one takes longer than this
+# percentile of the recent request latencies, when enough are known
+HEDGE_PERCENTILE = 0.9
+HEDGE_MIN_SAMPLES = 20
+
+# How long a response of meteo.gr is reused by other requests of its city
+COALESCE_TTL = 10  # seconds
+
+# How long the stations found for a city are reused by the config flow
+DISCOVERY_CACHE_TTL = 300  # seconds
 
 # Data constants
 ATTRIBUTION = "Data provided by meteo.gr"
@@ -1,16 +1,113 @@
 """DataUpdateCoordinator for the Meteo.gr integration."""
 
-from datetime import timedelta
+import asyncio
+from collections.abc import Mapping
+from dataclasses import fields
+from datetime import datetime, timedelta
 import logging
+import random
 
-from homeassistant.core import HomeAssistant
+import aiohttp
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
 from .api import MeteoGrScraper
-from .const import DOMAIN
+from .changes import NO_CHANGES
+from .const import (
+    CONF_ADAPTIVE_INTERVAL,
+    CONF_CITY_ID,
+    CONF_CONNECT_TIMEOUT,
+    CONF_FORECAST_INTERVAL,
+    CONF_FORECAST_STEP,
+    CONF_HEDGE_REQUESTS,
+    CONF_MAX_INTERVAL,
+    CONF_MIN_INTERVAL,
+    CONF_PARSE_EXECUTOR,
+    CONF_READ_TIMEOUT,
+    CONF_STALE_GRACE,
+    CONF_STREAM_PAGES,
+    CONF_UPDATE_INTERVAL,
+    CONF_UPDATE_TIMEOUT,
+    DATA_CITY_COORDINATORS,
+    DATA_FETCHER,
+    DEFAULT_ADAPTIVE_INTERVAL,
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_FORECAST_INTERVAL,
+    DEFAULT_FORECAST_STEP,
+    DEFAULT_HEDGE_REQUESTS,
+    DEFAULT_MAX_INTERVAL,
+    DEFAULT_MIN_INTERVAL,
+    DEFAULT_PARSE_EXECUTOR,
+    DEFAULT_READ_TIMEOUT,
+    DEFAULT_STALE_GRACE,
+    DEFAULT_STREAM_PAGES,
+    DEFAULT_UPDATE_INTERVAL,
+    DEFAULT_UPDATE_TIMEOUT,
+    DOMAIN,
+    PARSE_EXECUTOR_PROCESS,
+    PARSE_EXECUTOR_THREAD,
+    RETRY_INITIAL_DELAY,
+    SIGNAL_METRICS_UPDATED,
+)
+from .fetcher import MeteoGrFetcher
+from .forecast import ForecastViews
+from .history import StationHistory
+from .models import ForecastSlot, LiveObservation
+from .scheduler import AdaptiveScheduler
 
 _LOGGER = logging.getLogger(__name__)
 
+STORAGE_VERSION = 1
+STORAGE_SAVE_DELAY = 10  # seconds
+
+# Spreads the refresh phases of cities evenly over the update interval
+_STAGGER_STEP = 0.6180339887
+
+# Stored rows are lists of the record fields in order instead of dicts
+LIVE_FIELDS = tuple(field.name for field in fields(LiveObservation))
+FORECAST_FIELDS = tuple(field.name for field in fields(ForecastSlot))
+
+
+def _live_row(station: LiveObservation) -> list:
+    """Return the stored form of a live station."""
+    return [getattr(station, field) for field in LIVE_FIELDS]
+
+
+def _forecast_row(slot: ForecastSlot) -> list:
+    """Return the stored form of a forecast slot."""
+    row = [getattr(slot, field) for field in FORECAST_FIELDS]
+    row[0] = slot.datetime.isoformat()
+    return row
+
+
+def _forecast_slot(row: list) -> ForecastSlot:
+    """Return the forecast slot of a stored row."""
+    return ForecastSlot(datetime.fromisoformat(row[0]), *row[1:])
+
+
+def _build_data(
+    live: list[LiveObservation], forecast: list[ForecastSlot], history_version: int
+) -> dict:
+    """Return the data published to the entities."""
+    return {
+        "live": live,
+        "forecast": forecast,
+        # Sensors look up their station by name on every state write
+        "stations": {station.name: station for station in live},
+        # Tells the entities about a changed history with unchanged stations
+        "history_version": history_version,
+    }
+
+
+def _get_store(hass: HomeAssistant, city_id: int) -> Store:
+    """Return the store keeping the last data of a city."""
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{city_id}")
+
 
 class MeteoGrDataUpdateCoordinator(DataUpdateCoordinator):
     """Class to manage fetching Meteo.gr data."""
@@ -20,19 +117,364 @@ class MeteoGrDataUpdateCoordinator(DataUpdateCoordinator):
     ) -> None:
         """Initialize the data update coordinator."""
         self.api = api
+        # Options of every config entry sharing this coordinator
+        self._entry_options: dict[str, Mapping] = {}
+        self._base_interval = timedelta(minutes=update_interval)
+        self._adaptive = DEFAULT_ADAPTIVE_INTERVAL
+        self._min_interval = timedelta(minutes=DEFAULT_MIN_INTERVAL)
+        self._max_interval = timedelta(minutes=DEFAULT_MAX_INTERVAL)
+        self._scheduler = AdaptiveScheduler(("live", "forecast"))
+        # The forecast is only looked at every so often, unlike live data
+        self._forecast_interval = timedelta(minutes=DEFAULT_FORECAST_INTERVAL)
+        self._forecast_checked: datetime | None = None
+        self.stale_grace = timedelta(minutes=DEFAULT_STALE_GRACE)
+        self._failures = 0
+        self._store = _get_store(hass, api.city_id)
+        # When the current data was fetched from meteo.gr
+        self.last_fetch: datetime | None = None
+        self._forecast_views: ForecastViews | None = None
+        # Minutes between the times of the interpolated hourly forecast
+        self._forecast_step = DEFAULT_FORECAST_STEP
+        # What the latest update changed, per station name and forecast time
+        self.changes = NO_CHANGES
+        # Recent observations of every live station of the city
+        self.history: dict[str, StationHistory] = {}
+        # Whether the latest update changed the history, and how many did
+        self.history_changed = False
+        self._history_version = 0
+        # Held by the entry restoring or fetching the first data of the city,
+        # as the entries sharing the coordinator are set up concurrently
+        self.first_data_lock = asyncio.Lock()
         super().__init__(
             hass,
             _LOGGER,
-            name=DOMAIN,
+            # Shared by several entries, so its lifetime is not tied to one
+            config_entry=None,
+            name=f"{DOMAIN}_{api.city_id}",
             update_interval=timedelta(minutes=update_interval),
+            # Listeners are only told about data that changed
+            always_update=False,
         )
 
+    @property
+    def data_age(self) -> int | None:
+        """Return how many seconds ago the current data was fetched."""
+        if self.last_fetch is None:
+            return None
+        return int((dt_util.utcnow() - self.last_fetch).total_seconds())
+
+    @property
+    def forecast_views(self) -> ForecastViews:
+        """Return the views of the current forecast.
+
+        They are shared by the weather entities of every entry of the city
+        and only rebuilt once a new forecast is parsed.
+        """
+        forecast = self.data["forecast"] if self.data else []
+        views = self._forecast_views
+        if (
+            views is None
+            or views.slots is not forecast
+            or views.step != self._forecast_step
+        ):
+            views = self._forecast_views = ForecastViews(
+                forecast, self._forecast_step
+            )
+        return views
+
+    @callback
+    def async_add_entry(self, entry: ConfigEntry) -> None:
+        """Start serving a config entry."""
+        self._entry_options[entry.entry_id] = entry.options
+        self._async_apply_options()
+
+    @callback
+    def async_remove_entry(self, entry: ConfigEntry) -> bool:
+        """Stop serving a config entry, returning whether any are left."""
+        self._entry_options.pop(entry.entry_id, None)
+        if not self._entry_options:
+            return False
+        self._async_apply_options()
+        return True
+
+    @callback
+    def _async_apply_options(self) -> None:
+        """Serve the most demanding of the entries' options."""
+        options = self._entry_options.values()
+        self._base_interval = timedelta(
+            minutes=min(
+                option.get(CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL)
+                for option in options
+            )
+        )
+        self.stale_grace = timedelta(
+            minutes=max(
+                option.get(CONF_STALE_GRACE, DEFAULT_STALE_GRACE) for option in options
+            )
+        )
+        self._forecast_interval = timedelta(
+            minutes=min(
+                option.get(CONF_FORECAST_INTERVAL, DEFAULT_FORECAST_INTERVAL)
+                for option in options
+            )
+        )
+        self._adaptive = any(
+            option.get(CONF_ADAPTIVE_INTERVAL, DEFAULT_ADAPTIVE_INTERVAL)
+            for option in options
+        )
+        self._min_interval = timedelta(
+            minutes=min(
+                option.get(CONF_MIN_INTERVAL, DEFAULT_MIN_INTERVAL) for option in options
+            )
+        )
+        self._max_interval = max(
+            self._min_interval,
+            timedelta(
+                minutes=min(
+                    option.get(CONF_MAX_INTERVAL, DEFAULT_MAX_INTERVAL)
+                    for option in options
+                )
+            ),
+        )
+        self.api.timeout = aiohttp.ClientTimeout(
+            sock_connect=min(
+                option.get(CONF_CONNECT_TIMEOUT, DEFAULT_CONNECT_TIMEOUT)
+                for option in options
+            ),
+            sock_read=min(
+                option.get(CONF_READ_TIMEOUT, DEFAULT_READ_TIMEOUT)
+                for option in options
+            ),
+        )
+        self.api.update_timeout = min(
+            option.get(CONF_UPDATE_TIMEOUT, DEFAULT_UPDATE_TIMEOUT) for option in options
+        )
+        self.api.hedge = any(
+            option.get(CONF_HEDGE_REQUESTS, DEFAULT_HEDGE_REQUESTS) for option in options
+        )
+        self.api.parse_executor = (
+            PARSE_EXECUTOR_PROCESS
+            if any(
+                option.get(CONF_PARSE_EXECUTOR, DEFAULT_PARSE_EXECUTOR)
+                == PARSE_EXECUTOR_PROCESS
+                for option in options
+            )
+            else PARSE_EXECUTOR_THREAD
+        )
+        self.api.streaming = any(
+            option.get(CONF_STREAM_PAGES, DEFAULT_STREAM_PAGES) for option in options
+        )
+        self._forecast_step = min(
+            (
+                step
+                for option in options
+                if (step := option.get(CONF_FORECAST_STEP, DEFAULT_FORECAST_STEP))
+            ),
+            default=DEFAULT_FORECAST_STEP,
+        )
+        if not self._failures:
+            self.update_interval = self._next_interval(dt_util.utcnow())
+
+    def _staggered(self, now: datetime, interval: timedelta) -> timedelta:
+        """Return the time until the city's next slot of a fixed interval.
+
+        Every city refreshes at its own phase of the interval, so cities set
+        up together do not all hit meteo.gr at the same moment. The first
+        interval is between half and one and a half intervals long, the
+        following ones are exactly one.
+        """
+        period = interval.total_seconds()
+        if period <= 0:
+            # Saved before the options asked for a positive interval
+            return interval
+        phase = self.api.city_id * _STAGGER_STEP % 1 * period
+        delay = (phase - now.timestamp()) % period
+        if delay < period / 2:
+            delay += period
+        return timedelta(seconds=delay)
+
+    def _next_interval(self, now: datetime) -> timedelta:
+        """Return the interval until the next regular update."""
+        if not self._adaptive:
+            return self._staggered(now, self._base_interval)
+        return self._scheduler.next_interval(
+            now,
+            self._min_interval,
+            self._max_interval,
+            self._base_interval,
+            ("live",),
+        )
+
+    def _forecast_due(self, now: datetime) -> bool:
+        """Return whether the update starting now should look at the forecast.
+
+        Updates start on a grid of the live interval, so the forecast is due
+        up to half a live interval early rather than one interval late.
+        """
+        if self._forecast_checked is None:
+            return True
+        interval = self._forecast_interval
+        if self._adaptive:
+            interval = self._scheduler.next_interval(
+                self._forecast_checked,
+                self._min_interval,
+                self._forecast_interval,
+                self._forecast_interval,
+                ("forecast",),
+            )
+        return now - self._forecast_checked >= interval - self.update_interval / 2
+
+    def _retry_delay(self) -> timedelta:
+        """Return a jittered, exponentially growing delay until the next try."""
+        delay = min(
+            self._base_interval.total_seconds(),
+            RETRY_INITIAL_DELAY * 2 ** (self._failures - 1),
+        )
+        return timedelta(seconds=random.uniform(delay / 2, delay))
+
+    def _record_history(
+        self, live: list[LiveObservation], when: datetime, parsed: bool
+    ) -> None:
+        """Move the history of every station on to the time of an update.
+
+        Newly parsed observations are added. Without any, the observations
+        older than the spans are still dropped and the day still rolls over.
+        """
+        local = dt_util.as_local(when)
+        changed = False
+        for history in self.history.values():
+            changed |= history.advance(local)
+        if parsed:
+            for station in live:
+                if (history := self.history.get(station.name)) is None:
+                    history = self.history[station.name] = StationHistory()
+                history.add(station, local)
+                changed = True
+        self.history_changed = changed
+        if changed:
+            self._history_version += 1
+
+    async def async_restore(self, max_staleness: timedelta) -> bool:
+        """Serve the stored data of the last run, if it is recent enough."""
+        if (stored := await self._store.async_load()) is None:
+            return False
+        fetched = dt_util.parse_datetime(stored["fetched"])
+        if fetched is None or dt_util.utcnow() - fetched > max_staleness:
+            return False
+
+        self.last_fetch = fetched
+        # Later parses are diffed against the stored data
+        self.api.replace_data(
+            [LiveObservation(*row) for row in stored["live"]],
+            [_forecast_slot(row) for row in stored["forecast"]],
+        )
+        self.changes = self.api.changes
+        self._record_history(self.api.live_stations, fetched, True)
+        self.async_set_updated_data(
+            _build_data(
+                self.api.live_stations, self.api.forecast, self._history_version
+            )
+        )
+        return True
+
+    @callback
+    def _data_to_store(self) -> dict:
+        """Return the current data in its compact stored form."""
+        return {
+            "fetched": self.last_fetch.isoformat(),
+            "live": [_live_row(station) for station in self.data["live"]],
+            "forecast": [_forecast_row(slot) for slot in self.data["forecast"]],
+        }
+
     async def _async_update_data(self):
         """Fetch data from API."""
-        if not await self.api.update():
+        started = dt_util.utcnow()
+        check_forecast = self._forecast_due(started)
+        success = await self.api.update(forecast=check_forecast)
+        self.changes = self.api.changes
+        async_dispatcher_send(
+            self.hass, SIGNAL_METRICS_UPDATED.format(self.api.city_id)
+        )
+        if not success:
+            # Retry sooner than the next regular update
+            self._failures += 1
+            self.update_interval = self._retry_delay()
+            if (
+                self.data is not None
+                and self.last_fetch is not None
+                and dt_util.utcnow() - self.last_fetch <= self.stale_grace
+            ):
+                _LOGGER.warning(
+                    "Error communicating with meteo.gr for city %s, keeping the"
+                    " data of %s and retrying in %s",
+                    self.api.city_id,
+                    self.last_fetch,
+                    self.update_interval,
+                )
+                return self.data
             raise UpdateFailed("Error communicating with API")
 
-        return {
-            "live": self.api.live_stations,
-            "forecast": self.api.forecast,
-        }
+        self._failures = 0
+        self.last_fetch = dt_util.utcnow()
+        if self.api.live_hash is not None:
+            self._scheduler.observe("live", self.api.live_hash, self.last_fetch)
+        if check_forecast:
+            # When the update started, as the next one is due from then
+            self._forecast_checked = started
+            if self.api.forecast_hash is not None:
+                self._scheduler.observe(
+                    "forecast", self.api.forecast_hash, self.last_fetch
+                )
+        self._record_history(
+            self.api.live_stations, self.last_fetch, bool(self.changes.live)
+        )
+        self.update_interval = self._next_interval(self.last_fetch)
+        self._store.async_delay_save(self._data_to_store, STORAGE_SAVE_DELAY)
+        return _build_data(
+            self.api.live_stations, self.api.forecast, self._history_version
+        )
+
+
+@callback
+def async_acquire_coordinator(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> MeteoGrDataUpdateCoordinator:
+    """Return the coordinator of the entry's city, creating it if needed.
+
+    All entries of one city share a coordinator, so the page is fetched and
+    parsed once no matter how many stations of it are tracked.
+    """
+    coordinators = hass.data.setdefault(DATA_CITY_COORDINATORS, {})
+    city_id = entry.data[CONF_CITY_ID]
+    if (coordinator := coordinators.get(city_id)) is None:
+        if (fetcher := hass.data.get(DATA_FETCHER)) is None:
+            fetcher = hass.data[DATA_FETCHER] = MeteoGrFetcher()
+        api = MeteoGrScraper(fetcher.session, city_id, fetcher=fetcher)
+        coordinator = MeteoGrDataUpdateCoordinator(
+            hass,
+            api,
+            entry.options.get(CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL),
+        )
+        coordinators[city_id] = coordinator
+    coordinator.async_add_entry(entry)
+    return coordinator
+
+
+async def async_release_coordinator(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Release the entry's coordinator, shutting it down for the last entry.
+
+    The fetcher is closed along with the last coordinator.
+    """
+    coordinators = hass.data[DATA_CITY_COORDINATORS]
+    city_id = entry.data[CONF_CITY_ID]
+    coordinator = coordinators[city_id]
+    if not coordinator.async_remove_entry(entry):
+        del coordinators[city_id]
+        await coordinator.async_shutdown()
+        if not coordinators:
+            await hass.data.pop(DATA_FETCHER).close()
+
+
+async def async_remove_stored_data(hass: HomeAssistant, city_id: int) -> None:
+    """Remove the stored data of a city."""
+    await _get_store(hass, city_id).async_remove()
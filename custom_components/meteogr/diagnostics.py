@@ -0,0 +1,54 @@
+"""Diagnostics support for Meteo.gr."""
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .coordinator import MeteoGrDataUpdateCoordinator
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics of a config entry and of the updates of its city."""
+    coordinator: MeteoGrDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id][
+        "coordinator"
+    ]
+    api = coordinator.api
+    data = coordinator.data or {}
+    return {
+        "entry": {
+            "data": dict(entry.data),
+            "options": dict(entry.options),
+        },
+        "coordinator": {
+            "update_interval": coordinator.update_interval.total_seconds(),
+            "last_update_success": coordinator.last_update_success,
+            "last_exception": (
+                None
+                if coordinator.last_exception is None
+                else str(coordinator.last_exception)
+            ),
+            "last_fetch": coordinator.last_fetch,
+            "data_age": coordinator.data_age,
+            "stations": len(data.get("live", [])),
+            "forecast_rows": len(data.get("forecast", [])),
+            "last_changes": {
+                "live": coordinator.changes.live.as_dict(),
+                "forecast": coordinator.changes.forecast.as_dict(),
+            },
+        },
+        "scraper": {
+            "city_id": api.city_id,
+            "parser_backend": api.parser_backend,
+            "parse_executor": api.parse_executor,
+            "connect_timeout": api.timeout.sock_connect,
+            "read_timeout": api.timeout.sock_read,
+            "update_timeout": api.update_timeout,
+            "hedge_requests": api.hedge,
+            "stream_pages": api.streaming,
+        },
+        "metrics": api.metrics.as_dict(),
+    }
@@ -0,0 +1,79 @@
+"""Shared, rate limited fetching of meteo.gr pages."""
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+import time
+
+import aiohttp
+
+from .const import (
+    FETCH_BURST,
+    FETCH_KEEPALIVE_TIMEOUT,
+    FETCH_RATE,
+    MAX_CONCURRENT_FETCHES,
+)
+
+
+class TokenBucket:
+    """Let through a number of requests per second, with bursts."""
+
+    def __init__(self, rate: float, capacity: int) -> None:
+        """Initialize the bucket, full."""
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        # Waiters are served in order
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait until a request may be sent."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class MeteoGrFetcher:
+    """Send the requests of many scrapers to meteo.gr politely.
+
+    All requests go through one connection pool kept alive between
+    refreshes, at most a few at a time, and no faster than the token bucket
+    allows, however many cities refresh at the same moment.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = MAX_CONCURRENT_FETCHES,
+        rate: float = FETCH_RATE,
+        burst: int = FETCH_BURST,
+    ) -> None:
+        """Initialize the fetcher."""
+        self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=max_concurrent,
+                limit_per_host=max_concurrent,
+                keepalive_timeout=FETCH_KEEPALIVE_TIMEOUT,
+            )
+        )
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._bucket = TokenBucket(rate, burst)
+
+    @asynccontextmanager
+    async def throttle(self) -> AsyncIterator[None]:
+        """Hold one of the request slots, once the rate allows it."""
+        async with self._semaphore:
+            await self._bucket.acquire()
+            yield
+
+    async def close(self) -> None:
+        """Close the connections."""
+        await self.session.close()
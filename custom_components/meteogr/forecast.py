@@ -0,0 +1,224 @@
+"""Forecast aggregation for the Meteo.gr integration."""
+
+from collections import Counter
+from datetime import datetime
+from functools import cached_property
+from itertools import groupby
+import math
+
+import numpy as np
+
+from .interpolation import TIMEZONE, ForecastSeries
+from .models import ForecastSlot
+
+# Map meteo.gr condition names to HA condition names
+CONDITION_MAP = {
+    "Clear": "sunny",
+    "Few Clouds": "partlycloudy",
+    "Partly Cloudy": "partlycloudy",
+    "Cloudy": "cloudy",
+    "Thin Clouds": "cloudy",
+    "Light Rain": "rainy",
+    "Rain": "rainy",
+    "Storm": "lightning-rainy",
+    "Fog": "fog",
+    "Sleet": "snowy-rainy",
+    "Hail": "hail",
+    "Snow": "snowy",
+    "lightning": "lightning",
+    "pouring": "pouring",
+    # Add other conditions as you find them
+}
+# This list determines which condition is chosen for the daily forecast.
+# The first condition in this list that appears in a day's forecast will be used.
+CONDITION_SEVERITY_ORDER = [
+    "Hail"
+    "Sleet",
+    "Snow",
+    "Fog",
+    "Storm",
+    "Rain",
+    "Light Rain",
+    "Cloudy",
+    "Partly Cloudy",
+    "Thin Clouds",
+    "Few Clouds",
+    "Clear",
+]
+
+
+def build_hourly_forecast(hourly: list[ForecastSlot]) -> list[dict]:
+    """Return the hourly forecast in the form of Home Assistant forecasts."""
+    return [
+        dict(
+            datetime=item.datetime.isoformat(),
+            native_temperature=item.temperature,
+            native_wind_speed=item.wind_kmh,
+            wind_bearing=item.wind_dir,
+            condition=CONDITION_MAP.get(item.prediction, "unknown"),
+        )
+        for item in hourly
+    ]
+
+
+def _value(value: float, digits: int = 1) -> float | None:
+    """Return an interpolated value rounded, None if unknown."""
+    return None if math.isnan(value) else round(value, digits)
+
+
+def _bearing(value: float) -> float | None:
+    """Return an interpolated bearing rounded to a degree, None if unknown."""
+    return None if math.isnan(value) else round(value) % 360
+
+
+def build_interpolated_forecast(series: ForecastSeries, step: int) -> list[dict]:
+    """Return the forecast interpolated every step minutes.
+
+    The condition of each time is the one of the slot it falls in.
+    """
+    if not len(series):
+        return []
+    times = np.arange(series.times[0], series.times[-1] + 1, step * 60)
+    values = series.interpolate(times)
+    slots = series.slots
+    return [
+        dict(
+            datetime=datetime.fromtimestamp(timestamp, TIMEZONE)
+            .replace(tzinfo=None)
+            .isoformat(),
+            native_temperature=_value(temperature),
+            humidity=_value(humidity, 0),
+            native_wind_speed=_value(wind_kmh),
+            wind_bearing=_bearing(wind_bearing),
+            condition=CONDITION_MAP.get(slots[index].prediction, "unknown"),
+        )
+        for timestamp, temperature, humidity, wind_kmh, wind_bearing, index in zip(
+            times.tolist(),
+            values["temperature"].tolist(),
+            values["humidity"].tolist(),
+            values["wind_kmh"].tolist(),
+            values["wind_bearing"].tolist(),
+            series.slot_indices(times).tolist(),
+        )
+    ]
+
+
+def build_daily_forecast(hourly: list[ForecastSlot]) -> list[dict]:
+    """Aggregate the hourly forecast into one forecast per day."""
+    daily_forecasts = []
+    # Group hourly forecasts by day
+    for day, hourly_group in groupby(
+        hourly,
+        key=lambda f: f.datetime.date(),
+    ):
+        hourly_items = list(hourly_group)
+
+        # Extract temperatures, filtering out None values
+        temps = [
+            item.temperature
+            for item in hourly_items
+            if item.temperature is not None
+        ]
+        if not temps:
+            continue  # Skip day if no temperature data
+
+        # Find the most common condition and wind direction for the day
+        conditions = [
+            item.prediction for item in hourly_items if item.prediction
+        ]
+        worst_condition_for_day = None
+        if conditions:
+            # Iterate through our severity list (worst to best)
+            for severity in CONDITION_SEVERITY_ORDER:
+                if severity in conditions:
+                    worst_condition_for_day = severity
+                    break  # Found the worst one, no need to check further
+
+            # Fallback in case a new, unknown condition appears
+            if not worst_condition_for_day:
+                worst_condition_for_day = conditions[0]
+
+        wind_dirs = [item.wind_dir for item in hourly_items if item.wind_dir]
+
+        most_common_wind_dir = (
+            Counter(wind_dirs).most_common(1)[0][0] if wind_dirs else None
+        )
+
+        # Find max wind speed
+        wind_speeds = [
+            item.wind_kmh
+            for item in hourly_items
+            if item.wind_kmh is not None
+        ]
+
+        daily_forecasts.append(
+            dict(
+                datetime=datetime.combine(day, datetime.min.time()).isoformat(),
+                native_temperature=max(temps),
+                native_templow=min(temps),
+                condition=CONDITION_MAP.get(worst_condition_for_day, "unknown"),
+                native_wind_speed=max(wind_speeds) if wind_speeds else None,
+                wind_bearing=most_common_wind_dir,
+            )
+        )
+
+    return daily_forecasts
+
+
+class ForecastViews:
+    """The hourly and daily forecasts of a parsed forecast.
+
+    Each view is built the first time it is asked for and then reused until
+    a new forecast is parsed. With a step, the hourly forecast is
+    interpolated every step minutes instead of following the slots of
+    meteo.gr.
+    """
+
+    def __init__(self, slots: list[ForecastSlot], step: int = 0) -> None:
+        """Initialize the views."""
+        self.slots = slots
+        self.step = step
+        # Minute and values of the latest current values asked for
+        self._current: tuple[int, dict] | None = None
+
+    @cached_property
+    def series(self) -> ForecastSeries:
+        """Return the forecast as arrays to interpolate."""
+        return ForecastSeries(self.slots)
+
+    @cached_property
+    def hourly(self) -> list[dict]:
+        """Return the hourly forecast."""
+        if self.step:
+            return build_interpolated_forecast(self.series, self.step)
+        return build_hourly_forecast(self.slots)
+
+    def current(self, now: datetime) -> dict:
+        """Return the forecast values at a time, computed once a minute.
+
+        The condition is the one of the slot the time falls in.
+        """
+        minute = int(now.timestamp() // 60)
+        if self._current is not None and self._current[0] == minute:
+            return self._current[1]
+        if not self.slots:
+            values: dict = {}
+        else:
+            timestamp = np.array([minute * 60.0])
+            interpolated = self.series.interpolate(timestamp)
+            index = int(self.series.slot_indices(timestamp)[0])
+            ended = timestamp[0] > self.series.times[-1]
+            values = {
+                "temperature": _value(float(interpolated["temperature"][0])),
+                "humidity": _value(float(interpolated["humidity"][0]), 0),
+                "wind_kmh": _value(float(interpolated["wind_kmh"][0])),
+                "wind_bearing": _bearing(float(interpolated["wind_bearing"][0])),
+                "prediction": None if ended else self.slots[index].prediction,
+            }
+        self._current = (minute, values)
+        return values
+
+    @cached_property
+    def daily(self) -> list[dict]:
+        """Return the daily forecast."""
+        return build_daily_forecast(self.slots)
@@ -0,0 +1,156 @@
+"""Recent observations of the live stations with rolling statistics."""
+
+from array import array
+from collections import deque
+from datetime import date, datetime
+
+from .models import LiveObservation
+
+# Span of the windows of the tendencies, as reported by weather services
+TENDENCY_SPAN = 3 * 3600  # seconds
+# Most observations kept per window, the oldest being dropped first
+WINDOW_CAPACITY = 288
+
+
+class RollingWindow:
+    """Observations of one quantity over a span of time.
+
+    Values are kept in fixed-size arrays used as a ring buffer. The sum and
+    the monotonic queues of the minimum and maximum candidates are updated
+    as values come and go, so adding a value and reading any statistic take
+    constant time on average.
+    """
+
+    def __init__(self, span: float | None, capacity: int = WINDOW_CAPACITY) -> None:
+        """Initialize the window, None spanning until it is cleared."""
+        self.span = span
+        self._times = array("d", bytes(8 * capacity))
+        self._values = array("d", bytes(8 * capacity))
+        # Position of the oldest value and number of values
+        self._start = 0
+        self._size = 0
+        self._sum = 0.0
+        # Number of values ever added, numbering them in order
+        self._added = 0
+        # (number, value) of the values which may still become the min or max
+        self._mins: deque[tuple[int, float]] = deque()
+        self._maxs: deque[tuple[int, float]] = deque()
+
+    def __len__(self) -> int:
+        """Return the number of values."""
+        return self._size
+
+    def clear(self) -> None:
+        """Drop all values."""
+        self._start = self._size = 0
+        self._sum = 0.0
+        self._mins.clear()
+        self._maxs.clear()
+
+    def _drop_oldest(self) -> None:
+        """Drop the oldest value."""
+        # Numbered by order, as several values may share a timestamp
+        oldest = self._added - self._size
+        self._sum -= self._values[self._start]
+        self._start = (self._start + 1) % len(self._times)
+        self._size -= 1
+        for candidates in (self._mins, self._maxs):
+            if candidates and candidates[0][0] <= oldest:
+                candidates.popleft()
+
+    def expire(self, timestamp: float) -> bool:
+        """Drop the values older than the span at a timestamp.
+
+        Returns whether any value was dropped.
+        """
+        if self.span is None:
+            return False
+        size = self._size
+        while self._size and self._times[self._start] < timestamp - self.span:
+            self._drop_oldest()
+        return self._size != size
+
+    def add(self, timestamp: float, value: float) -> None:
+        """Add the value observed at a timestamp, later than the others."""
+        self.expire(timestamp)
+        if self._size == len(self._times):
+            self._drop_oldest()
+
+        end = (self._start + self._size) % len(self._times)
+        self._times[end] = timestamp
+        self._values[end] = value
+        self._size += 1
+        self._sum += value
+        number = self._added
+        self._added += 1
+        while self._mins and self._mins[-1][1] >= value:
+            self._mins.pop()
+        self._mins.append((number, value))
+        while self._maxs and self._maxs[-1][1] <= value:
+            self._maxs.pop()
+        self._maxs.append((number, value))
+
+    @property
+    def minimum(self) -> float | None:
+        """Return the lowest value."""
+        return self._mins[0][1] if self._size else None
+
+    @property
+    def maximum(self) -> float | None:
+        """Return the highest value."""
+        return self._maxs[0][1] if self._size else None
+
+    @property
+    def mean(self) -> float | None:
+        """Return the mean of the values."""
+        return self._sum / self._size if self._size else None
+
+    @property
+    def change(self) -> float | None:
+        """Return how much the latest value differs from the oldest one."""
+        if self._size < 2:
+            return None
+        latest = (self._start + self._size - 1) % len(self._times)
+        return self._values[latest] - self._values[self._start]
+
+
+class StationHistory:
+    """Rolling statistics of the observations of a live station."""
+
+    def __init__(self) -> None:
+        """Initialize the history."""
+        self.day: date | None = None
+        self.temperature_recent = RollingWindow(TENDENCY_SPAN)
+        self.pressure_recent = RollingWindow(TENDENCY_SPAN)
+        self.temperature_today = RollingWindow(None)
+        self.wind_today = RollingWindow(None)
+
+    def advance(self, when: datetime) -> bool:
+        """Move on to a local time, later than the observations.
+
+        Drops the recent observations older than their span, and those of
+        the day before once the date changes. Returns whether any statistic
+        may have changed.
+        """
+        changed = False
+        if when.date() != self.day:
+            self.day = when.date()
+            changed = bool(self.temperature_today or self.wind_today)
+            self.temperature_today.clear()
+            self.wind_today.clear()
+        timestamp = when.timestamp()
+        changed |= self.temperature_recent.expire(timestamp)
+        changed |= self.pressure_recent.expire(timestamp)
+        return changed
+
+    def add(self, observation: LiveObservation, when: datetime) -> None:
+        """Add an observation, made at a local time later than the others."""
+        self.advance(when)
+        timestamp = when.timestamp()
+        if observation.temperature is not None:
+            self.temperature_recent.add(timestamp, observation.temperature)
+            self.temperature_today.add(timestamp, observation.temperature)
+        if observation.pressure is not None:
+            self.pressure_recent.add(timestamp, observation.pressure)
+        if observation.wind_kmh is not None:
+            self.wind_today.add(timestamp, observation.wind_kmh)
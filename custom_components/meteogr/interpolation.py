@@ -0,0 +1,102 @@
+"""Interpolation of the forecast at any time."""
+
+from collections.abc import Iterable
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+from .models import ForecastSlot
+
+# meteo.gr gives the forecast in Greek local time
+TIMEZONE = ZoneInfo("Europe/Athens")
+
+COMPASS_POINTS = [
+    "N",
+    "NNE",
+    "NE",
+    "ENE",
+    "E",
+    "ESE",
+    "SE",
+    "SSE",
+    "S",
+    "SSW",
+    "SW",
+    "WSW",
+    "W",
+    "WNW",
+    "NW",
+    "NNW",
+]
+# Degrees of every compass point, clockwise from north
+BEARINGS = {point: number * 22.5 for number, point in enumerate(COMPASS_POINTS)}
+
+
+def slot_timestamp(slot_time: datetime) -> float:
+    """Return the POSIX timestamp of a time of the forecast."""
+    return slot_time.replace(tzinfo=TIMEZONE).timestamp()
+
+
+def _array(values: Iterable[float | None]) -> np.ndarray:
+    """Return values as a float array, missing values being NaN."""
+    return np.array(
+        [np.nan if value is None else value for value in values], dtype=float
+    )
+
+
+def _interpolate(x: np.ndarray, xp: np.ndarray, fp: np.ndarray) -> np.ndarray:
+    """Interpolate linearly over the known values only."""
+    known = ~np.isnan(fp)
+    if not known.any():
+        return np.full(x.shape, np.nan)
+    return np.interp(x, xp[known], fp[known])
+
+
+class ForecastSeries:
+    """The forecast as arrays, interpolated at many times in one go.
+
+    Scalars are interpolated linearly. The wind direction is interpolated
+    on the unit circle, so that between NW and NE it turns through N instead
+    of through S. Times before the first slot get the values of the first
+    slot, times after the last one get no values.
+    """
+
+    def __init__(self, slots: list[ForecastSlot]) -> None:
+        """Build the arrays of the forecast slots."""
+        self.slots = slots
+        self.times = np.array([slot_timestamp(slot.datetime) for slot in slots])
+        self.temperature = _array(slot.temperature for slot in slots)
+        self.humidity = _array(slot.humidity for slot in slots)
+        self.wind_kmh = _array(slot.wind_kmh for slot in slots)
+        bearings = np.radians(_array(BEARINGS.get(slot.wind_dir) for slot in slots))
+        self._wind_x = np.sin(bearings)
+        self._wind_y = np.cos(bearings)
+
+    def __len__(self) -> int:
+        """Return the number of slots."""
+        return len(self.slots)
+
+    def slot_indices(self, timestamps: np.ndarray) -> np.ndarray:
+        """Return the index of the slot each timestamp falls in."""
+        return np.clip(np.searchsorted(self.times, timestamps, "right") - 1, 0, None)
+
+    def interpolate(self, timestamps: Iterable[float]) -> dict[str, np.ndarray]:
+        """Return the forecast values at POSIX timestamps, NaN where unknown."""
+        x = np.asarray(timestamps, dtype=float)
+        values = {
+            "temperature": _interpolate(x, self.times, self.temperature),
+            "humidity": _interpolate(x, self.times, self.humidity),
+            "wind_kmh": _interpolate(x, self.times, self.wind_kmh),
+        }
+        wind_x = _interpolate(x, self.times, self._wind_x)
+        wind_y = _interpolate(x, self.times, self._wind_y)
+        bearing = np.degrees(np.arctan2(wind_x, wind_y)) % 360
+        # Opposite directions cancel out, leaving no direction at all
+        bearing[np.hypot(wind_x, wind_y) < 1e-6] = np.nan
+        values["wind_bearing"] = bearing
+        if len(self.times):
+            after = x > self.times[-1]
+            for array in values.values():
+                array[after] = np.nan
+        return values
@@ -0,0 +1,124 @@
+"""Performance metrics of the Meteo.gr integration."""
+
+from bisect import bisect_left
+from collections import deque
+from collections.abc import Iterator
+
+# Number of recent samples each histogram is computed over
+HISTOGRAM_SAMPLES = 100
+
+
+class RollingHistogram:
+    """Distribution of the latest samples of a measurement."""
+
+    def __init__(
+        self, bounds: tuple[float, ...], maxlen: int = HISTOGRAM_SAMPLES
+    ) -> None:
+        """Initialize the histogram with the upper bounds of its buckets."""
+        self.bounds = bounds
+        self.samples: deque[float] = deque(maxlen=maxlen)
+
+    def __len__(self) -> int:
+        """Return the number of samples."""
+        return len(self.samples)
+
+    def __iter__(self) -> Iterator[float]:
+        """Iterate over the samples, oldest first."""
+        return iter(self.samples)
+
+    def add(self, value: float) -> None:
+        """Record a sample."""
+        self.samples.append(value)
+
+    def percentile(self, fraction: float) -> float | None:
+        """Return the sample below which a fraction of the samples fall."""
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[int(fraction * (len(ordered) - 1))]
+
+    def as_dict(self) -> dict:
+        """Return a summary of the samples and their bucket counts."""
+        if not self.samples:
+            return {"count": 0}
+        ordered = sorted(self.samples)
+        buckets = [0] * (len(self.bounds) + 1)
+        for value in ordered:
+            buckets[bisect_left(self.bounds, value)] += 1
+        labels = [f"<={bound:g}" for bound in self.bounds]
+        labels.append(f">{self.bounds[-1]:g}")
+        return {
+            "count": len(ordered),
+            "min": ordered[0],
+            "mean": sum(ordered) / len(ordered),
+            "p50": ordered[int(0.5 * (len(ordered) - 1))],
+            "p90": ordered[int(0.9 * (len(ordered) - 1))],
+            "p99": ordered[int(0.99 * (len(ordered) - 1))],
+            "max": ordered[-1],
+            "buckets": dict(zip(labels, buckets)),
+        }
+
+
+class ScraperMetrics:
+    """What the fetches and parses of a city cost."""
+
+    def __init__(self) -> None:
+        """Initialize the metrics."""
+        # Seconds
+        self.fetch_latency = RollingHistogram((0.1, 0.25, 0.5, 1, 2.5, 5, 10))
+        # Seconds, of the fetches answered with the page, not with 304
+        self.page_latency = RollingHistogram((0.1, 0.25, 0.5, 1, 2.5, 5, 10))
+        # Bytes of the page read, all of it unless streamed
+        self.response_size = RollingHistogram((50e3, 100e3, 200e3, 400e3, 800e3))
+        # Seconds
+        self.parse_live = RollingHistogram((0.001, 0.005, 0.01, 0.05, 0.1, 0.5))
+        self.parse_forecast = RollingHistogram((0.005, 0.01, 0.05, 0.1, 0.5, 1))
+        self.stations = RollingHistogram((0, 2, 5, 10, 20))
+        self.forecast_rows = RollingHistogram((0, 24, 48, 96, 192))
+        # Fetches answered by a request of their own
+        self.requests = 0
+        # Fetches answered by another fetch of the city, running or recent
+        self.coalesced = 0
+        # Fetches told by the server that the page is not modified
+        self.not_modified = 0
+        # Fetches of a page with the same content as the last one parsed
+        self.unchanged = 0
+        self.hedged = 0
+        # Streamed responses whose end was not read, the sections being complete
+        self.stopped_early = 0
+        self.timeouts = 0
+        self.failures = 0
+
+    @property
+    def fetches(self) -> int:
+        """Return the number of fetches, however they were answered."""
+        return self.requests + self.coalesced
+
+    def rate(self, count: int) -> float | None:
+        """Return the share of the fetches a count makes up."""
+        if not self.fetches:
+            return None
+        return count / self.fetches
+
+    def as_dict(self) -> dict:
+        """Return the metrics, for diagnostics."""
+        return {
+            "fetches": self.fetches,
+            "requests": self.requests,
+            "coalesced": self.coalesced,
+            "not_modified": self.not_modified,
+            "unchanged": self.unchanged,
+            "hedged": self.hedged,
+            "stopped_early": self.stopped_early,
+            "timeouts": self.timeouts,
+            "failures": self.failures,
+            "cache_hit_rate": self.rate(self.coalesced),
+            "not_modified_rate": self.rate(self.not_modified + self.unchanged),
+            "fetch_latency": self.fetch_latency.as_dict(),
+            "page_latency": self.page_latency.as_dict(),
+            "response_size": self.response_size.as_dict(),
+            "parse_live": self.parse_live.as_dict(),
+            "parse_forecast": self.parse_forecast.as_dict(),
+            "stations": self.stations.as_dict(),
+            "forecast_rows": self.forecast_rows.as_dict(),
+        }
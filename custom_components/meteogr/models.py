@@ -0,0 +1,30 @@
+"""Data records of the Meteo.gr integration."""
+
+from dataclasses import dataclass
+from datetime import datetime
+
+
+@dataclass(frozen=True, slots=True)
+class LiveObservation:
+    """The latest measurements of a live station."""
+
+    name: str
+    temperature: float | None
+    humidity: int | None
+    pressure: float | None
+    wind_kmh: float | None
+    wind_bf: int | None
+    wind_dir: str | None
+
+
+@dataclass(frozen=True, slots=True)
+class ForecastSlot:
+    """One time step of the forecast, in the local time of meteo.gr."""
+
+    datetime: datetime
+    temperature: int | None
+    humidity: int | None
+    wind_kmh: int | None
+    wind_bf: int | None
+    wind_dir: str
+    prediction: str
@@ -0,0 +1,749 @@
+"""Parser backends turning meteo.gr pages into live station and forecast data."""
+
+from abc import ABC, abstractmethod
+from datetime import date, datetime
+import hashlib
+import logging
+import re
+from time import perf_counter
+from typing import NamedTuple
+
+from bs4 import BeautifulSoup, NavigableString
+
+try:
+    from lxml import etree, html as lxml_html
+except ImportError:
+    lxml_html = None
+
+from .models import ForecastSlot, LiveObservation
+
+_LOGGER = logging.getLogger(__name__)
+
+PARSER_BEAUTIFULSOUP = "beautifulsoup"
+PARSER_LXML = "lxml"
+
+_MONTHS = {
+    name: num
+    for num, name in enumerate(
+        [
+            "January",
+            "February",
+            "March",
+            "April",
+            "May",
+            "June",
+            "July",
+            "August",
+            "September",
+            "October",
+            "November",
+            "December",
+        ],
+        1,
+    )
+}
+
+
+def _clean_value(value, value_type=int):
+    """Extract a number from a string and convert it."""
+    if value is None:
+        return None
+    match = re.search(r"[-+]?\d*\.\d+|[-+]?\d+", str(value))
+    if match:
+        try:
+            return value_type(float(match.group()))
+        except (ValueError, TypeError):
+            return None
+    return None
+
+
+# Start tags of the page regions the parsers use, and of the dust block
+# which is dropped from them.
+_LIVE_START = re.compile(r"""<div\b[^>]*?\sid\s*=\s*["']?live(?=["'\s/>])""", re.I)
+_FORECAST_START = re.compile(r"""<table\b[^>]*?\sid\s*=\s*["']?outerTable""", re.I)
+_HIDDEN_CLASS = re.compile(
+    r"""\sclass\s*=\s*["']?(?:[^"'>]*\s)?hidden-xs(?=["'\s/>])""", re.I
+)
+_DUST_START = re.compile(r"""<div\b[^>]*?\sid\s*=\s*["']?dust(?=["'\s/>])""", re.I)
+_TAGS = {
+    "div": re.compile(r"<(/?)div\b", re.I),
+    "table": re.compile(r"<(/?)table\b", re.I),
+}
+
+
+# Start of the footer of the page, expected after all the sections. Not yet
+# checked against recorded pages; without it, pages are read to the end.
+_PAGE_END = re.compile(r"<footer\b", re.I)
+
+
+def _closed_element_end(html: str, start: int, tag: str) -> int | None:
+    """Return the offset right after an element, None if it is not closed."""
+    depth = 0
+    for match in _TAGS[tag].finditer(html, start):
+        depth += -1 if match.group(1) else 1
+        if depth == 0:
+            end = html.find(">", match.end())
+            return None if end == -1 else end + 1
+    return None
+
+
+def _element_end(html: str, start: int, tag: str) -> int:
+    """Return the offset right after the element starting at an offset."""
+    end = _closed_element_end(html, start, tag)
+    return len(html) if end is None else end
+
+
+def _strip_dust(markup: str) -> str:
+    """Remove the dust blocks from a piece of markup."""
+    while match := _DUST_START.search(markup):
+        end = _element_end(markup, match.start(), "div")
+        markup = markup[: match.start()] + markup[end:]
+    return markup
+
+
+def extract_live(html: str) -> str:
+    """Cut the live block out of a page.
+
+    Scanning the raw text is much cheaper than building a tree of the whole
+    page, which is mostly navigation, scripts and ads.
+    """
+    if (match := _LIVE_START.search(html)) is None:
+        return ""
+    return _strip_dust(html[match.start() : _element_end(html, match.start(), "div")])
+
+
+def extract_forecast(html: str) -> str:
+    """Cut the visible forecast tables out of a page."""
+    forecast = []
+    position = 0
+    while match := _FORECAST_START.search(html, position):
+        start_tag = html[match.start() : html.find(">", match.start()) + 1]
+        if _HIDDEN_CLASS.search(start_tag):
+            # Never parsed, but a visible table might still be nested in it
+            position = match.end()
+            continue
+        position = _element_end(html, match.start(), "table")
+        forecast.append(_strip_dust(html[match.start() : position]))
+    return "".join(forecast)
+
+
+class SectionScanner:
+    """Cut the live block and the forecast tables out of a page as it arrives.
+
+    The page is fed in pieces as it is received. Everything around the
+    sections is dropped once scanned, so only the sections are kept, and
+    the sections are complete as soon as the footer follows them. Each
+    section is available as soon as it is closed, to be parsed while the
+    rest of the page arrives. The markup returned holds the same sections
+    as extract_live and extract_forecast cut out of the whole page.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the scanner."""
+        # Text not scanned yet, starting with any section not closed yet
+        self._buffer = ""
+        # Markup of the live block and of each forecast table closed so far
+        self.live: str | None = None
+        self.tables: list[str] = []
+        self.complete = False
+
+    def feed(self, text: str) -> bool:
+        """Scan more of the page, returning whether the sections are complete."""
+        if self.complete:
+            return True
+        buffer = self._buffer + text
+        position = 0
+        while True:
+            end_of_page = None
+            if self.live is not None and self.tables:
+                end_of_page = _PAGE_END.search(buffer, position)
+            limit = len(buffer) if end_of_page is None else end_of_page.start()
+            starts = [_FORECAST_START.search(buffer, position, limit)]
+            if self.live is None:
+                starts.append(_LIVE_START.search(buffer, position, limit))
+            starts = [match for match in starts if match is not None]
+            if not starts:
+                if end_of_page is not None:
+                    self.complete = True
+                    position = len(buffer)
+                else:
+                    # Keep what may be a start tag cut in two
+                    cut = buffer.rfind("<", position)
+                    position = len(buffer) if cut == -1 else cut
+                break
+
+            match = min(starts, key=lambda match: match.start())
+            if match.re is _LIVE_START:
+                end = _closed_element_end(buffer, match.start(), "div")
+                if end is None:
+                    position = match.start()
+                    break
+                self.live = _strip_dust(buffer[match.start() : end])
+                position = end
+                continue
+
+            tag_end = buffer.find(">", match.start())
+            if tag_end == -1:
+                position = match.start()
+                break
+            if _HIDDEN_CLASS.search(buffer[match.start() : tag_end + 1]):
+                # Never parsed, but a visible table might still be nested in it
+                position = match.end()
+                continue
+            end = _closed_element_end(buffer, match.start(), "table")
+            if end is None:
+                position = match.start()
+                break
+            self.tables.append(_strip_dust(buffer[match.start() : end]))
+            position = end
+        self._buffer = buffer[position:]
+        return self.complete
+
+    def markup(self) -> str:
+        """Return the markup of the sections, once the page was fed.
+
+        Sections left open run to the end of the page, and are available
+        like the others from then on.
+        """
+        if self._buffer:
+            if self.live is None:
+                self.live = extract_live(self._buffer) or None
+            if tables := extract_forecast(self._buffer):
+                self.tables.append(tables)
+            self._buffer = ""
+        return (self.live or "") + "".join(self.tables)
+
+
+class ParsedPage(NamedTuple):
+    """The data of a page and hashes of the markup it was parsed from.
+
+    A section is None when it was not parsed, either because it was not asked
+    for or because its markup did not change, and so is the number of seconds
+    its parse took. The forecast hash is None when the forecast was not asked
+    for.
+    """
+
+    live: list[LiveObservation] | None
+    forecast: list[ForecastSlot] | None
+    live_hash: bytes
+    forecast_hash: bytes | None
+    live_seconds: float | None = None
+    forecast_seconds: float | None = None
+
+
+def section_hash(markup: str) -> bytes:
+    """Return a short hash of a piece of markup."""
+    return hashlib.blake2b(markup.encode(), digest_size=16).digest()
+
+
+class MeteoGrParser(ABC):
+    """Base class of the page parser backends.
+
+    Every backend must return exactly the same data for the same page.
+    """
+
+    name: str
+
+    def parse(self, html: str) -> tuple[list[LiveObservation], list[ForecastSlot]]:
+        """Return the live stations and the forecast found in a page."""
+        return (
+            self.parse_live(extract_live(html)),
+            self.parse_forecast(extract_forecast(html)),
+        )
+
+    def parse_page(
+        self,
+        html: str,
+        live_hash: bytes | None = None,
+        forecast_hash: bytes | None = None,
+        include_forecast: bool = True,
+    ) -> ParsedPage:
+        """Return the changed data of a page along with hashes of its sections.
+
+        Sections whose markup still has the given hash are not parsed again,
+        and the forecast is not even looked at unless included.
+        """
+        start = perf_counter()
+        live_markup = extract_live(html)
+        new_live_hash = section_hash(live_markup)
+        live = live_seconds = None
+        if new_live_hash != live_hash:
+            live = self.parse_live(live_markup)
+            live_seconds = perf_counter() - start
+
+        forecast = new_forecast_hash = forecast_seconds = None
+        if include_forecast:
+            start = perf_counter()
+            forecast_markup = extract_forecast(html)
+            new_forecast_hash = section_hash(forecast_markup)
+            if new_forecast_hash != forecast_hash:
+                forecast = self.parse_forecast(forecast_markup)
+                forecast_seconds = perf_counter() - start
+
+        return ParsedPage(
+            live,
+            forecast,
+            new_live_hash,
+            new_forecast_hash,
+            live_seconds,
+            forecast_seconds,
+        )
+
+    def parse_live(self, markup: str) -> list[LiveObservation]:
+        """Return the live stations found in the markup of the live block."""
+        if not markup.strip():
+            return []
+        return self._parse_live_stations(self._build(markup))
+
+    def parse_station_names(self, markup: str) -> list[str]:
+        """Return the names of the live stations in the markup of the live block.
+
+        Only the station headings are read, which is all the config flow
+        needs to offer the stations of a city.
+        """
+        if not markup.strip():
+            return []
+        return self._parse_station_names(self._build(markup))
+
+    def parse_forecast(self, markup: str) -> list[ForecastSlot]:
+        """Return the forecast found in the markup of the forecast tables."""
+        if not markup.strip():
+            return []
+        return self._parse_forecast(self._build(markup))
+
+    @abstractmethod
+    def _build(self, html: str):
+        """Return the document tree of the markup."""
+
+    @abstractmethod
+    def _parse_live_stations(self, tree) -> list[LiveObservation]:
+        """Parse live station data."""
+
+    @abstractmethod
+    def _parse_station_names(self, tree) -> list[str]:
+        """Parse the names of the live stations."""
+
+    @abstractmethod
+    def _parse_forecast(self, tree) -> list[ForecastSlot]:
+        """Parse the hourly forecast."""
+
+
+class SoupParser(MeteoGrParser):
+    """Parser using BeautifulSoup with the pure Python html.parser."""
+
+    name = PARSER_BEAUTIFULSOUP
+
+    def _build(self, html: str) -> BeautifulSoup:
+        """Return the document tree of the markup."""
+        return BeautifulSoup(html, "html.parser")
+
+    def _parse_live_stations(self, soup: BeautifulSoup):
+        """Parse live station data."""
+        live_container = soup.find("div", id="live")
+        if not live_container:
+            return []
+
+        station_names_divs = live_container.select(".nowHead2")
+        station_panels = live_container.select(".nowpanel")
+
+        stations_data = []
+        for name_div, panel_div in zip(station_names_divs, station_panels, strict=False):
+            if name_div is None:
+                continue
+            try:
+                station_name = name_div.find(string=True, recursive=False).strip()
+                temp_tag = panel_div.select_one(".nowtemp")
+                humid_tags = panel_div.find_all("div", {"class": "humid"})
+                if humid_tags is None:
+                    continue
+                temperature = None
+                if temp_tag:
+                    temperature = temp_tag.get_text()
+                humidity = None
+                if len(humid_tags) > 0:
+                    if len(humid_tags[0].contents) > 1:
+                        humidity = humid_tags[0].contents[1]
+                pressure = None
+                if len(humid_tags) > 1:
+                    if len(humid_tags[1].contents) > 1:
+                        pressure = humid_tags[1].contents[1]
+                wind_kmh = None
+                if panel_div.select_one(".windnumber"):
+                    wind_kmh = panel_div.select_one(".windnumber").get_text()
+                wind_bf = None
+                if panel_div.select_one(".nowbeaufort"):
+                    wind_bf = panel_div.select_one(".nowbeaufort").get_text()
+                wind_dir = None
+                if panel_div.select_one(".winddirection"):
+                    wind_dir = panel_div.select_one(".winddirection").get_text(strip=True)
+                stations_data.append(
+                    LiveObservation(
+                        name=station_name,
+                        temperature=_clean_value(temperature, float),
+                        humidity=_clean_value(humidity, int),
+                        pressure=_clean_value(pressure, float),
+                        wind_kmh=_clean_value(wind_kmh, float),
+                        wind_bf=_clean_value(wind_bf, int),
+                        wind_dir=wind_dir,
+                    )
+                )
+            except (AttributeError, IndexError) as e:
+                _LOGGER.warning("Skipping a station due to parsing error: %s", e)
+                continue
+        return stations_data
+
+    def _parse_station_names(self, soup: BeautifulSoup) -> list[str]:
+        """Parse the names of the live stations."""
+        live_container = soup.find("div", id="live")
+        if not live_container:
+            return []
+
+        names = []
+        # Stations without a panel are not parsed, so they are not offered
+        for name_div, _ in zip(
+            live_container.select(".nowHead2"),
+            live_container.select(".nowpanel"),
+            strict=False,
+        ):
+            if (name := name_div.find(string=True, recursive=False)) is not None:
+                names.append(name.strip())
+        return names
+
+    def _parse_forecast(self, soup: BeautifulSoup):
+        # Remove Dust
+        elements = soup.find_all("div", id="dust")
+        for element in elements:
+            element.decompose()
+
+        stations_data = []
+        day = ""
+        month = ""
+        time = ""
+        temperature = ""
+        humidity = ""
+        wind_kmh = ""
+        wind_dir = ""
+        wind_bf = ""
+        prediction = ""
+        for prognosis in soup.select("table[id^=outerTable]:not(.hidden-xs)"):
+            for table in prognosis.find_all("tr"):
+                day_find = table.find("td", {"class": "forecastDate"})
+                if day_find is not None:
+                    day = int(
+                        day_find.find("span", {"class": "dayNumbercf"})
+                        .contents[0]
+                        .strip()
+                    )
+                    month = _MONTHS.get(
+                        day_find.find("span", {"class": "monthNumbercf"})
+                        .get_text()
+                        .strip()
+                    )
+                    today = date.today()
+                    current_year = today.year
+                    forecast_year = (
+                        current_year + 1 if month < today.month else current_year
+                    )
+
+                if "perhour" in str(table.get("class")):
+                    try:
+                        time = table.find("table").get_text().strip()
+                        hour, minute = map(int, time.split(":"))
+                        forecast_datetime = datetime(
+                            forecast_year, month, day, hour, minute
+                        )
+                    except:
+                        continue
+                    humidity_find = table.find("td", {"class": "humidity"})
+                    temperature_find = table.find("td", {"class": "temperature"})
+                    wind_find = table.find("td", {"class": "anemosfull"})
+                    prediction_find = table.find("td", {"class": "phenomeno-name"})
+                    if temperature_find is not None and len(temperature_find.contents) > 0:
+                        if isinstance(temperature_find.contents[0], NavigableString):
+                            temperature = temperature_find.contents[0].strip()
+                        if len(temperature_find.contents) > 1 and isinstance(temperature_find.contents[1], NavigableString):
+                            temperature = temperature_find.contents[1].strip()
+                    if humidity_find is not None and len(humidity_find.contents) > 0:
+                        humidity = humidity_find.contents[0].strip()
+                    if wind_find is not None:
+                        wind_bf = "0"
+                        wind_dir = ""
+                        wind_kmh = "0"
+                        if wind_find.td.span is not None:
+                            if len(wind_find.td.span.contents) > 0:
+                                wind_kmh, _ = wind_find.td.span.contents[0].strip().split()
+                            wind_bf, _, wind_dir = (
+                                wind_find.td.contents[0].strip().split()
+                            )
+                    prediction_find = table.find("td", {"class": "phenomeno-name"})
+                    if prediction_find is not None:
+                        prediction = ""
+                        if len(prediction_find.contents) > 0:
+                            prediction = prediction_find.contents[0].strip()
+                        stations_data.append(
+                            ForecastSlot(
+                                datetime=forecast_datetime,
+                                temperature=_clean_value(temperature),
+                                humidity=_clean_value(humidity),
+                                wind_kmh=_clean_value(wind_kmh),
+                                wind_bf=_clean_value(wind_bf),
+                                wind_dir=wind_dir,
+                                prediction=prediction,
+                            )
+                        )
+        return stations_data
+
+
+def _has_class(name: str) -> str:
+    """Return an XPath predicate matching one class of the class attribute."""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+class LxmlParser(MeteoGrParser):
+    """Parser using lxml with precompiled XPath queries.
+
+    The queries mirror the BeautifulSoup lookups one to one, so that the
+    output of both backends stays identical.
+    """
+
+    name = PARSER_LXML
+
+    def __init__(self) -> None:
+        """Compile the queries."""
+        xpath = etree.XPath
+        self._live = xpath("(//div[@id='live'])[1]")
+        self._name_divs = xpath(f".//*[{_has_class('nowHead2')}]")
+        self._panels = xpath(f".//*[{_has_class('nowpanel')}]")
+        self._temperature = xpath(f"(.//*[{_has_class('nowtemp')}])[1]")
+        self._humid = xpath(f".//div[{_has_class('humid')}]")
+        self._wind_kmh = xpath(f"(.//*[{_has_class('windnumber')}])[1]")
+        self._wind_bf = xpath(f"(.//*[{_has_class('nowbeaufort')}])[1]")
+        self._wind_dir = xpath(f"(.//*[{_has_class('winddirection')}])[1]")
+        self._dust = xpath("//div[@id='dust']")
+        self._forecast_tables = xpath(
+            "//table[starts-with(@id, 'outerTable')"
+            f" and not({_has_class('hidden-xs')})]"
+        )
+        self._rows = xpath(".//tr")
+        self._forecast_date = xpath(f"(.//td[{_has_class('forecastDate')}])[1]")
+        self._day_number = xpath(f"(.//span[{_has_class('dayNumbercf')}])[1]")
+        self._month_number = xpath(f"(.//span[{_has_class('monthNumbercf')}])[1]")
+        self._time_table = xpath("(.//table)[1]")
+        self._row_humidity = xpath(f"(.//td[{_has_class('humidity')}])[1]")
+        self._row_temperature = xpath(f"(.//td[{_has_class('temperature')}])[1]")
+        self._row_wind = xpath(f"(.//td[{_has_class('anemosfull')}])[1]")
+        self._row_prediction = xpath(f"(.//td[{_has_class('phenomeno-name')}])[1]")
+        self._first_td = xpath("(.//td)[1]")
+        self._first_span = xpath("(.//span)[1]")
+
+    def _build(self, html: str):
+        """Return the document tree of the markup."""
+        if not html.strip():
+            # lxml refuses empty documents
+            return lxml_html.document_fromstring("<html></html>")
+        return lxml_html.document_fromstring(html)
+
+    @staticmethod
+    def _first(result: list):
+        """Return the first match of a query, like BeautifulSoup's find."""
+        return result[0] if result else None
+
+    @staticmethod
+    def _text(element) -> str:
+        """Return the text of an element, like BeautifulSoup's get_text."""
+        return "".join(element.itertext())
+
+    @staticmethod
+    def _contents(element) -> list:
+        """Return the children of an element, like BeautifulSoup's contents.
+
+        Text nodes are returned as strings and comments as their text, the
+        same way BeautifulSoup treats them as strings.
+        """
+        contents = [element.text] if element.text else []
+        for child in element:
+            contents.append(child.text if child.tag is etree.Comment else child)
+            if child.tail:
+                contents.append(child.tail)
+        return contents
+
+    @staticmethod
+    def _markup(node) -> str:
+        """Return a text node as is and an element as its markup."""
+        if isinstance(node, str):
+            return node
+        return etree.tostring(node, encoding="unicode", with_tail=False)
+
+    def _parse_live_stations(self, root):
+        """Parse live station data."""
+        live_container = self._first(self._live(root))
+        if live_container is None:
+            return []
+
+        stations_data = []
+        for name_div, panel_div in zip(
+            self._name_divs(live_container), self._panels(live_container), strict=False
+        ):
+            try:
+                station_name = next(
+                    (
+                        node
+                        for node in self._contents(name_div)
+                        if isinstance(node, str)
+                    ),
+                    None,
+                ).strip()
+                temp_tag = self._first(self._temperature(panel_div))
+                humid_tags = self._humid(panel_div)
+                temperature = None
+                if temp_tag is not None:
+                    temperature = self._text(temp_tag)
+                humidity = None
+                if len(humid_tags) > 0:
+                    contents = self._contents(humid_tags[0])
+                    if len(contents) > 1:
+                        humidity = self._markup(contents[1])
+                pressure = None
+                if len(humid_tags) > 1:
+                    contents = self._contents(humid_tags[1])
+                    if len(contents) > 1:
+                        pressure = self._markup(contents[1])
+                wind_kmh = None
+                if (tag := self._first(self._wind_kmh(panel_div))) is not None:
+                    wind_kmh = self._text(tag)
+                wind_bf = None
+                if (tag := self._first(self._wind_bf(panel_div))) is not None:
+                    wind_bf = self._text(tag)
+                wind_dir = None
+                if (tag := self._first(self._wind_dir(panel_div))) is not None:
+                    wind_dir = "".join(
+                        text.strip() for text in tag.itertext() if text.strip()
+                    )
+                stations_data.append(
+                    LiveObservation(
+                        name=station_name,
+                        temperature=_clean_value(temperature, float),
+                        humidity=_clean_value(humidity, int),
+                        pressure=_clean_value(pressure, float),
+                        wind_kmh=_clean_value(wind_kmh, float),
+                        wind_bf=_clean_value(wind_bf, int),
+                        wind_dir=wind_dir,
+                    )
+                )
+            except (AttributeError, IndexError) as e:
+                _LOGGER.warning("Skipping a station due to parsing error: %s", e)
+                continue
+        return stations_data
+
+    def _parse_station_names(self, root) -> list[str]:
+        """Parse the names of the live stations."""
+        live_container = self._first(self._live(root))
+        if live_container is None:
+            return []
+
+        names = []
+        for name_div, _ in zip(
+            self._name_divs(live_container), self._panels(live_container), strict=False
+        ):
+            name = next(
+                (node for node in self._contents(name_div) if isinstance(node, str)),
+                None,
+            )
+            if name is not None:
+                names.append(name.strip())
+        return names
+
+    def _parse_forecast(self, root):
+        """Parse the hourly forecast."""
+        # Remove Dust
+        for element in self._dust(root):
+            element.drop_tree()
+
+        stations_data = []
+        temperature = ""
+        humidity = ""
+        wind_kmh = ""
+        wind_dir = ""
+        wind_bf = ""
+        for prognosis in self._forecast_tables(root):
+            for row in self._rows(prognosis):
+                day_find = self._first(self._forecast_date(row))
+                if day_find is not None:
+                    day_number = self._first(self._day_number(day_find))
+                    month_number = self._first(self._month_number(day_find))
+                    day = int(self._contents(day_number)[0].strip())
+                    month = _MONTHS.get(self._text(month_number).strip())
+                    today = date.today()
+                    forecast_year = (
+                        today.year + 1 if month < today.month else today.year
+                    )
+
+                if "perhour" in str(row.get("class")):
+                    try:
+                        time = self._text(self._first(self._time_table(row))).strip()
+                        hour, minute = map(int, time.split(":"))
+                        forecast_datetime = datetime(
+                            forecast_year, month, day, hour, minute
+                        )
+                    except Exception:
+                        continue
+                    humidity_find = self._first(self._row_humidity(row))
+                    temperature_find = self._first(self._row_temperature(row))
+                    wind_find = self._first(self._row_wind(row))
+                    if temperature_find is not None:
+                        contents = self._contents(temperature_find)
+                        if len(contents) > 0 and isinstance(contents[0], str):
+                            temperature = contents[0].strip()
+                        if len(contents) > 1 and isinstance(contents[1], str):
+                            temperature = contents[1].strip()
+                    if humidity_find is not None:
+                        contents = self._contents(humidity_find)
+                        if len(contents) > 0:
+                            humidity = contents[0].strip()
+                    if wind_find is not None:
+                        wind_bf = "0"
+                        wind_dir = ""
+                        wind_kmh = "0"
+                        wind_td = self._first(self._first_td(wind_find))
+                        wind_span = self._first(self._first_span(wind_td))
+                        if wind_span is not None:
+                            contents = self._contents(wind_span)
+                            if len(contents) > 0:
+                                wind_kmh, _ = contents[0].strip().split()
+                            wind_bf, _, wind_dir = (
+                                self._contents(wind_td)[0].strip().split()
+                            )
+                    prediction_find = self._first(self._row_prediction(row))
+                    if prediction_find is not None:
+                        prediction = ""
+                        contents = self._contents(prediction_find)
+                        if len(contents) > 0:
+                            prediction = contents[0].strip()
+                        stations_data.append(
+                            ForecastSlot(
+                                datetime=forecast_datetime,
+                                temperature=_clean_value(temperature),
+                                humidity=_clean_value(humidity),
+                                wind_kmh=_clean_value(wind_kmh),
+                                wind_bf=_clean_value(wind_bf),
+                                wind_dir=wind_dir,
+                                prediction=prediction,
+                            )
+                        )
+        return stations_data
+
+
+_parsers: dict[str, MeteoGrParser] = {}
+
+
+def get_parser(name: str | None = None) -> MeteoGrParser:
+    """Return a parser backend, the fastest one available by default.
+
+    Falls back to BeautifulSoup when lxml is not installed.
+    """
+    if name is None or (name == PARSER_LXML and lxml_html is None):
+        name = PARSER_LXML if lxml_html is not None else PARSER_BEAUTIFULSOUP
+    if name not in _parsers:
+        parser_class = LxmlParser if name == PARSER_LXML else SoupParser
+        _parsers[name] = parser_class()
+    return _parsers[name]
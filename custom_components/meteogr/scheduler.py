@@ -0,0 +1,104 @@
+"""Adaptive refresh scheduling for the Meteo.gr integration."""
+
+from collections.abc import Iterable
+from datetime import datetime, timedelta
+
+# Weight of the latest change period in the learned average
+PERIOD_SMOOTHING = 0.3
+# Part of the learned period around the expected change polled densely
+CHANGE_WINDOW_RATIO = 0.1
+# Most times the interval doubles while a change is late, so that it stays a
+# valid timedelta however long a section stays the same
+MAX_BACKOFF_DOUBLINGS = 16
+
+
+class _Section:
+    """Change history of one section of the page."""
+
+    def __init__(self) -> None:
+        """Initialize the section."""
+        self.content_hash: bytes | None = None
+        self.last_change: datetime | None = None
+        # Smoothed number of seconds between two changes
+        self.period: float | None = None
+        # Polls without a change since the expected change was missed
+        self.misses = 0
+
+    def observe(self, content_hash: bytes, now: datetime) -> bool:
+        """Record the hash of the section, returning whether it changed."""
+        if content_hash == self.content_hash:
+            if self.period is not None and now > self._window_end():
+                self.misses += 1
+            return False
+
+        if self.content_hash is not None:
+            # The first hash seen says nothing about when it changed
+            if self.last_change is not None:
+                elapsed = (now - self.last_change).total_seconds()
+                self.period = (
+                    elapsed
+                    if self.period is None
+                    else PERIOD_SMOOTHING * elapsed
+                    + (1 - PERIOD_SMOOTHING) * self.period
+                )
+            self.last_change = now
+        self.content_hash = content_hash
+        self.misses = 0
+        return True
+
+    def _window_end(self) -> datetime:
+        """Return when the section should have changed at the latest."""
+        return self.last_change + timedelta(seconds=self.period * (1 + CHANGE_WINDOW_RATIO))
+
+    def next_interval(
+        self, now: datetime, minimum: timedelta, fallback: timedelta
+    ) -> timedelta:
+        """Return how long to wait before polling the section again."""
+        if self.period is None:
+            return fallback
+
+        expected = self.last_change + timedelta(seconds=self.period)
+        window = max(minimum, timedelta(seconds=self.period * CHANGE_WINDOW_RATIO))
+        if now < expected - window:
+            # Sleep until the expected change gets close
+            return expected - window - now
+        if now <= expected + window:
+            return minimum
+        # The change is late, so back off until it shows up
+        return minimum * 2 ** min(self.misses, MAX_BACKOFF_DOUBLINGS)
+
+
+class AdaptiveScheduler:
+    """Learn when sections of the page change and when to poll for them.
+
+    Each section is expected to change again after the smoothed period of its
+    previous changes. Polls are dense around that moment, sparse before it and
+    back off exponentially while an expected change does not show up.
+    """
+
+    def __init__(self, sections: Iterable[str]) -> None:
+        """Initialize the scheduler."""
+        self._sections = {section: _Section() for section in sections}
+
+    def observe(self, section: str, content_hash: bytes, now: datetime) -> bool:
+        """Record the hash of a section, returning whether it changed."""
+        return self._sections[section].observe(content_hash, now)
+
+    def next_interval(
+        self,
+        now: datetime,
+        minimum: timedelta,
+        maximum: timedelta,
+        fallback: timedelta,
+        sections: Iterable[str] | None = None,
+    ) -> timedelta:
+        """Return how long to wait before the next poll of some sections.
+
+        The fallback is used until a section has changed twice, and the
+        result is always kept between the minimum and the maximum.
+        """
+        interval = min(
+            self._sections[section].next_interval(now, minimum, fallback)
+            for section in (self._sections if sections is None else sections)
+        )
+        return max(minimum, min(maximum, interval))
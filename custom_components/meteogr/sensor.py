@@ -1,5 +1,9 @@
 """Sensor platform for Meteo.gr."""
 
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime
+
 from homeassistant.components.sensor import (
     SensorDeviceClass,
     SensorEntity,
@@ -9,16 +13,30 @@ from homeassistant.components.sensor import (
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
     PERCENTAGE,
+    EntityCategory,
+    UnitOfInformation,
     UnitOfPressure,
     UnitOfSpeed,
     UnitOfTemperature,
+    UnitOfTime,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.typing import StateType
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import ATTRIBUTION, CONF_STATION_NAME, DOMAIN
+from .const import (
+    ATTRIBUTION,
+    CONF_DIAGNOSTIC_SENSORS,
+    CONF_STATION_NAME,
+    DEFAULT_DIAGNOSTIC_SENSORS,
+    DOMAIN,
+    SIGNAL_METRICS_UPDATED,
+)
 from .coordinator import MeteoGrDataUpdateCoordinator
+from .history import StationHistory
+from .metrics import ScraperMetrics
 
 SENSOR_TYPES: tuple[SensorEntityDescription, ...] = (
     SensorEntityDescription(
@@ -65,6 +83,145 @@ SENSOR_TYPES: tuple[SensorEntityDescription, ...] = (
 )
 
 
+@dataclass(frozen=True, kw_only=True)
+class MeteoGrTrendSensorEntityDescription(SensorEntityDescription):
+    """Describes a sensor of the recent observations of a station."""
+
+    value_fn: Callable[[StationHistory], float | None]
+
+
+TREND_SENSOR_TYPES: tuple[MeteoGrTrendSensorEntityDescription, ...] = (
+    MeteoGrTrendSensorEntityDescription(
+        key="temperature_change_3h",
+        name="Temperature Change 3h",
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+        icon="mdi:thermometer-lines",
+        value_fn=lambda history: history.temperature_recent.change,
+    ),
+    MeteoGrTrendSensorEntityDescription(
+        key="temperature_mean_3h",
+        name="Temperature Mean 3h",
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        device_class=SensorDeviceClass.TEMPERATURE,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+        value_fn=lambda history: history.temperature_recent.mean,
+    ),
+    MeteoGrTrendSensorEntityDescription(
+        key="temperature_min_today",
+        name="Temperature Min Today",
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        device_class=SensorDeviceClass.TEMPERATURE,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda history: history.temperature_today.minimum,
+    ),
+    MeteoGrTrendSensorEntityDescription(
+        key="temperature_max_today",
+        name="Temperature Max Today",
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        device_class=SensorDeviceClass.TEMPERATURE,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda history: history.temperature_today.maximum,
+    ),
+    MeteoGrTrendSensorEntityDescription(
+        key="pressure_tendency",
+        name="Pressure Tendency",
+        native_unit_of_measurement=UnitOfPressure.HPA,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+        icon="mdi:gauge",
+        value_fn=lambda history: history.pressure_recent.change,
+    ),
+    MeteoGrTrendSensorEntityDescription(
+        key="wind_max_today",
+        name="Wind Speed Max Today",
+        native_unit_of_measurement=UnitOfSpeed.KILOMETERS_PER_HOUR,
+        device_class=SensorDeviceClass.WIND_SPEED,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:weather-windy",
+        value_fn=lambda history: history.wind_today.maximum,
+    ),
+)
+
+
+def _percent(rate: float | None) -> float | None:
+    """Return a rate as a percentage."""
+    return None if rate is None else round(rate * 100, 1)
+
+
+def _milliseconds(seconds: float | None) -> float | None:
+    """Return a duration in seconds in milliseconds."""
+    return None if seconds is None else seconds * 1000
+
+
+@dataclass(frozen=True, kw_only=True)
+class MeteoGrDiagnosticSensorEntityDescription(SensorEntityDescription):
+    """Describes a sensor of the performance of a city's updates."""
+
+    value_fn: Callable[[ScraperMetrics], StateType]
+
+
+DIAGNOSTIC_SENSOR_TYPES: tuple[MeteoGrDiagnosticSensorEntityDescription, ...] = (
+    MeteoGrDiagnosticSensorEntityDescription(
+        key="fetch_latency",
+        name="Fetch Latency",
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=2,
+        value_fn=lambda metrics: metrics.fetch_latency.percentile(0.5),
+    ),
+    MeteoGrDiagnosticSensorEntityDescription(
+        key="parse_live",
+        name="Live Parse Time",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+        value_fn=lambda metrics: _milliseconds(metrics.parse_live.percentile(0.5)),
+    ),
+    MeteoGrDiagnosticSensorEntityDescription(
+        key="parse_forecast",
+        name="Forecast Parse Time",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+        value_fn=lambda metrics: _milliseconds(
+            metrics.parse_forecast.percentile(0.5)
+        ),
+    ),
+    MeteoGrDiagnosticSensorEntityDescription(
+        key="response_size",
+        name="Response Size",
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        device_class=SensorDeviceClass.DATA_SIZE,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_unit_of_measurement=UnitOfInformation.KILOBYTES,
+        value_fn=lambda metrics: metrics.response_size.percentile(0.5),
+    ),
+    MeteoGrDiagnosticSensorEntityDescription(
+        key="not_modified_rate",
+        name="Unchanged Page Rate",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:cached",
+        value_fn=lambda metrics: _percent(
+            metrics.rate(metrics.not_modified + metrics.unchanged)
+        ),
+    ),
+    MeteoGrDiagnosticSensorEntityDescription(
+        key="failures",
+        name="Update Failures",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        icon="mdi:alert-circle-outline",
+        value_fn=lambda metrics: metrics.failures,
+    ),
+)
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,
@@ -78,6 +235,15 @@ async def async_setup_entry(
         MeteoGrSensor(coordinator, description, station_name)
         for description in SENSOR_TYPES
     ]
+    entities.extend(
+        MeteoGrTrendSensor(coordinator, description, station_name)
+        for description in TREND_SENSOR_TYPES
+    )
+    if entry.options.get(CONF_DIAGNOSTIC_SENSORS, DEFAULT_DIAGNOSTIC_SENSORS):
+        entities.extend(
+            MeteoGrDiagnosticSensor(coordinator, description, station_name)
+            for description in DIAGNOSTIC_SENSOR_TYPES
+        )
     async_add_entities(entities)
 
 
@@ -107,11 +273,108 @@ class MeteoGrSensor(CoordinatorEntity[MeteoGrDataUpdateCoordinator], SensorEntit
             "manufacturer": "Meteo.gr",
             "entry_type": "service",
         }
+        # Availability and value of the last state written
+        self._written_state: tuple[bool, object] | None = None
 
     @property
     def native_value(self):
         """Return the state of the sensor."""
-        for station in self.coordinator.data["live"]:
-            if station["name"] == self._station_name:
-                return station.get(self.entity_description.key)
-        return None
+        station = self.coordinator.data["stations"].get(self._station_name)
+        if station is None:
+            return None
+        return getattr(station, self.entity_description.key)
+
+    def _station_changed(self) -> bool:
+        """Return whether the latest update changed the station."""
+        return self._station_name in self.coordinator.changes.live
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only when the sensor changed."""
+        if (
+            self._written_state is not None
+            and self.available == self._written_state[0]
+            and not self._station_changed()
+        ):
+            return
+        state = (self.available, self.native_value)
+        if state == self._written_state:
+            return
+        self._written_state = state
+        self.async_write_ha_state()
+
+    @property
+    def extra_state_attributes(self) -> dict[str, datetime | None]:
+        """Return when the data was fetched.
+
+        A time rather than an age, as states are only written when they
+        change and an age would be stale right away.
+        """
+        return {"last_fetch": self.coordinator.last_fetch}
+
+
+class MeteoGrTrendSensor(MeteoGrSensor):
+    """A sensor of the recent observations of a station.
+
+    Computed from the history kept by the coordinator, without reading the
+    recorder database.
+    """
+
+    entity_description: MeteoGrTrendSensorEntityDescription
+
+    def _station_changed(self) -> bool:
+        """Return whether the latest update changed the station's history."""
+        # Observations expire and days roll over without any new one
+        return self.coordinator.history_changed
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the state of the sensor."""
+        history = self.coordinator.history.get(self._station_name)
+        if history is None:
+            return None
+        return self.entity_description.value_fn(history)
+
+
+class MeteoGrDiagnosticSensor(SensorEntity):
+    """A sensor of the performance of the updates of a city.
+
+    Written after every update attempt, unlike the entities following the
+    coordinator, which are only told about changed data.
+    """
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_should_poll = False
+    entity_description: MeteoGrDiagnosticSensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: MeteoGrDataUpdateCoordinator,
+        description: MeteoGrDiagnosticSensorEntityDescription,
+        station_name: str,
+    ) -> None:
+        """Initialize the sensor."""
+        self.coordinator = coordinator
+        self.entity_description = description
+        self._attr_unique_id = (
+            f"{coordinator.api.city_id}_{station_name}_{description.key}"
+        )
+        self._attr_name = f"{station_name} {description.name}"
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, f"{coordinator.api.city_id}_{station_name}")},
+        }
+
+    async def async_added_to_hass(self) -> None:
+        """Write the state after every update attempt of the city."""
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_METRICS_UPDATED.format(self.coordinator.api.city_id),
+                self.async_write_ha_state,
+            )
+        )
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the state of the sensor."""
+        return self.entity_description.value_fn(self.coordinator.api.metrics)
@@ -0,0 +1,184 @@
+"""Services of the Meteo.gr integration."""
+
+import asyncio
+import time
+
+import voluptuous as vol
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+import homeassistant.helpers.config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from .api import MeteoGrScraper
+from .const import DOMAIN
+
+SERVICE_PROFILE_UPDATE = "profile_update"
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_TOP = "top"
+
+# Profilers and the memory tracer are process wide, so one profile at a time
+_PROFILE_LOCK = asyncio.Lock()
+
+PROFILE_UPDATE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_TOP, default=20): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=100)
+        ),
+    }
+)
+
+
+def _enable_profiler(profiler) -> None:
+    """Start a profiler, failing the action if another profiler runs."""
+    try:
+        profiler.enable()
+    except ValueError as err:
+        # Python 3.12 and later run a single profiler at a time
+        raise HomeAssistantError(
+            f"Cannot profile while another profiler is running: {err}"
+        ) from err
+
+
+def _profile_call(func, *args):
+    """Run a function under cProfile in the calling thread."""
+    import cProfile
+
+    profiler = cProfile.Profile()
+    _enable_profiler(profiler)
+    try:
+        result = func(*args)
+    finally:
+        profiler.disable()
+    return result, profiler
+
+
+async def _async_profile_update(call: ServiceCall) -> ServiceResponse:
+    """Profile a full update of the city of a config entry.
+
+    The page is fetched and parsed from scratch by a scraper of its own, so
+    the coordinator and its data are left alone. The fetch is profiled on
+    the event loop, the parse in the executor thread running it, and the
+    memory allocated by both is traced. Only one profile runs at a time.
+    """
+    hass = call.hass
+    entry = hass.config_entries.async_get_entry(call.data[ATTR_CONFIG_ENTRY_ID])
+    if entry is None or entry.domain != DOMAIN:
+        raise ServiceValidationError("Unknown Meteo.gr config entry")
+    if entry.state is not ConfigEntryState.LOADED:
+        raise ServiceValidationError("The config entry is not loaded")
+    if _PROFILE_LOCK.locked():
+        raise ServiceValidationError("A profile is already running")
+    async with _PROFILE_LOCK:
+        return await _async_profile(call, entry.entry_id)
+
+
+async def _async_profile(call: ServiceCall, entry_id: str) -> ServiceResponse:
+    """Profile an update, holding the profile lock."""
+    # Only loaded when profiling, so they cost nothing otherwise
+    import cProfile
+    import pstats
+    import tracemalloc
+
+    hass = call.hass
+    api: MeteoGrScraper = hass.data[DOMAIN][entry_id]["coordinator"].api
+    scraper = MeteoGrScraper(
+        api.session,
+        api.city_id,
+        parser_backend=api.parser_backend,
+        fetcher=api.fetcher,
+    )
+    scraper.timeout = api.timeout
+    scraper.streaming = api.streaming
+    top = call.data[ATTR_TOP]
+
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    try:
+        fetch_profiler = cProfile.Profile()
+        start = time.perf_counter()
+        _enable_profiler(fetch_profiler)
+        try:
+            # Always a request of its own, never a recent response reused
+            html = await scraper.fetch_page()
+        finally:
+            fetch_profiler.disable()
+        fetch_seconds = time.perf_counter() - start
+        if html is None:
+            raise HomeAssistantError("Error communicating with meteo.gr")
+
+        page, parse_profiler = await hass.async_add_executor_job(
+            _profile_call, scraper.parse_page, html
+        )
+        peak = tracemalloc.get_traced_memory()[1]
+        # Walking every traced block takes a while on a busy instance
+        snapshot = await hass.async_add_executor_job(tracemalloc.take_snapshot)
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+
+    stats = pstats.Stats(fetch_profiler)
+    stats.add(parse_profiler)
+    path = hass.config.path(
+        f"{DOMAIN}_profile_{api.city_id}_{dt_util.now():%Y%m%d%H%M%S}.prof"
+    )
+    await hass.async_add_executor_job(stats.dump_stats, path)
+    allocations = await hass.async_add_executor_job(snapshot.statistics, "lineno")
+
+    hotspots = []
+    for (filename, line, function), (_, calls, own, cumulative, _) in sorted(
+        stats.stats.items(), key=lambda item: item[1][3], reverse=True
+    )[:top]:
+        hotspots.append(
+            {
+                "function": f"{filename}:{line}({function})",
+                "calls": calls,
+                "own_seconds": round(own, 6),
+                "cumulative_seconds": round(cumulative, 6),
+            }
+        )
+    return {
+        "city_id": api.city_id,
+        "parser_backend": scraper.parser_backend,
+        "fetch_seconds": round(fetch_seconds, 4),
+        "fetch_profile_note": (
+            "The fetch is profiled on the event loop, so its profile includes"
+            " every other coroutine that ran while the page was fetched."
+        ),
+        "parse_live_seconds": page.live_seconds,
+        "parse_forecast_seconds": page.forecast_seconds,
+        "page_bytes": len(html.encode()),
+        "stations": len(page.live or []),
+        "forecast_rows": len(page.forecast or []),
+        "peak_memory_kib": round(peak / 1024, 1),
+        "stats_file": path,
+        "hotspots": hotspots,
+        "allocations": [
+            {
+                "location": str(stat.traceback),
+                "size_kib": round(stat.size / 1024, 1),
+                "count": stat.count,
+            }
+            for stat in allocations[:top]
+        ],
+    }
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the services of the integration."""
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE_UPDATE,
+        _async_profile_update,
+        schema=PROFILE_UPDATE_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
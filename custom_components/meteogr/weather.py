@@ -1,8 +1,6 @@
 """Weather platform for Meteo.gr."""
 
-from collections import Counter
-from datetime import datetime
-from itertools import groupby
+from datetime import datetime, timedelta
 
 from homeassistant.components.weather import (
     Forecast,
@@ -11,47 +9,18 @@ from homeassistant.components.weather import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import UnitOfPressure, UnitOfSpeed, UnitOfTemperature
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import dt as dt_util
 
 from .const import ATTRIBUTION, CONF_STATION_NAME, DOMAIN
 from .coordinator import MeteoGrDataUpdateCoordinator
+from .forecast import CONDITION_MAP
 
-# Map meteo.gr condition names to HA condition names
-CONDITION_MAP = {
-    "Clear": "sunny",
-    "Few Clouds": "partlycloudy",
-    "Partly Cloudy": "partlycloudy",
-    "Cloudy": "cloudy",
-    "Thin Clouds": "cloudy",
-    "Light Rain": "rainy",
-    "Rain": "rainy",
-    "Storm": "lightning-rainy",
-    "Fog": "fog",
-    "Sleet": "snowy-rainy",
-    "Hail": "hail",
-    "Snow": "snowy",
-    "lightning": "lightning",
-    "pouring": "pouring",
-    # Add other conditions as you find them
-}
-# This list determines which condition is chosen for the daily forecast.
-# The first condition in this list that appears in a day's forecast will be used.
-CONDITION_SEVERITY_ORDER = [
-    "Hail"
-    "Sleet",
-    "Snow",
-    "Fog",
-    "Storm",
-    "Rain",
-    "Light Rain",
-    "Cloudy",
-    "Partly Cloudy",
-    "Thin Clouds",
-    "Few Clouds",
-    "Clear",
-]
+# How often the current values are interpolated again between updates
+CURRENT_INTERVAL = timedelta(minutes=1)
 
 
 async def async_setup_entry(
@@ -86,6 +55,10 @@ class MeteoGrWeather(CoordinatorEntity[MeteoGrDataUpdateCoordinator], WeatherEnt
         """Initialize the sensor."""
         super().__init__(coordinator)
         self._station_name = station_name
+        # Current values of the latest state written between updates
+        self._written: dict | None = None
+        # Availability of the latest state written on an update
+        self._written_available: bool | None = None
         self._attr_unique_id = f"{coordinator.api.city_id}_weather"
         self._attr_name = f"Meteo.gr {station_name}"
         self._attr_device_info = {
@@ -94,131 +67,90 @@ class MeteoGrWeather(CoordinatorEntity[MeteoGrDataUpdateCoordinator], WeatherEnt
             "manufacturer": "Meteo.gr",
             "entry_type": "service",
         }
-        # To hold the calculated daily forecast
-        self._daily_forecast = []
+
+    async def async_added_to_hass(self) -> None:
+        """Follow the forecast as time goes by, not only on updates."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_track_time_interval(
+                self.hass, self._async_update_current, CURRENT_INTERVAL
+            )
+        )
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only when the forecast or availability changed."""
+        if (
+            self.available == self._written_available
+            and not self.coordinator.changes.forecast
+        ):
+            return
+        self._written_available = self.available
+        self._written = self._current()
+        self.async_write_ha_state()
+
+    @callback
+    def _async_update_current(self, now: datetime) -> None:
+        """Write the state if the current values moved along the forecast."""
+        current = self._current()
+        if current != self._written:
+            self._written = current
+            self.async_write_ha_state()
+
+    def _current(self) -> dict:
+        """Return the forecast values at the current time."""
+        if not self.coordinator.data:
+            return {}
+        return self.coordinator.forecast_views.current(dt_util.utcnow())
 
     @property
     def condition(self) -> str | None:
         """Return the current condition."""
-        if not self.coordinator.data or not self.coordinator.data["forecast"]:
+        if (prediction := self._current().get("prediction")) is None:
             return None
-        prediction = self.coordinator.data["forecast"][0].get("prediction")
         return CONDITION_MAP.get(prediction, "unknown")
 
     @property
     def native_temperature(self) -> float | None:
         """Return the temperature."""
-        if not self.coordinator.data or not self.coordinator.data["forecast"]:
-            return None
-        return self.coordinator.data["forecast"][0].get("temperature")
+        return self._current().get("temperature")
 
     # NEW PROPERTY: Add native_templow for the current day
     @property
     def native_templow(self) -> float | None:
         """Return the low temperature of the current day."""
-        if not self._daily_forecast:
+        if not (daily_forecast := self.coordinator.forecast_views.daily):
             return None
-        return self._daily_forecast[0].get("native_templow")
+        return daily_forecast[0].get("native_templow")
 
     @property
     def humidity(self) -> float | None:
         """Return the humidity."""
-        if not self.coordinator.data or not self.coordinator.data["forecast"]:
-            return None
-        return self.coordinator.data["forecast"][0].get("humidity")
+        return self._current().get("humidity")
 
     @property
     def native_wind_speed(self) -> float | None:
         """Return the wind speed."""
-        if not self.coordinator.data or not self.coordinator.data["forecast"]:
-            return None
-        return self.coordinator.data["forecast"][0].get("wind_kmh")
+        return self._current().get("wind_kmh")
 
     @property
-    def wind_bearing(self) -> str | None:
-        """Return the wind bearing."""
-        if not self.coordinator.data or not self.coordinator.data["forecast"]:
-            return None
-        return self.coordinator.data["forecast"][0].get("wind_dir")
+    def wind_bearing(self) -> float | None:
+        """Return the wind bearing in degrees."""
+        return self._current().get("wind_bearing")
+
+    @property
+    def extra_state_attributes(self) -> dict[str, datetime | None]:
+        """Return when the data was fetched."""
+        return {"last_fetch": self.coordinator.last_fetch}
 
     async def async_forecast_hourly(self) -> list[Forecast] | None:
         """Return the hourly forecast."""
         if not self.coordinator.data or not self.coordinator.data["forecast"]:
             return None
-
-        forecasts = []
-        for item in self.coordinator.data["forecast"]:
-            myforecast = Forecast(
-                datetime=item["datetime"],
-                native_temperature=item["temperature"],
-                native_wind_speed=item["wind_kmh"],
-                wind_bearing=item["wind_dir"],
-                condition=CONDITION_MAP.get(item["prediction"], "unknown"),
-            )
-            forecasts.append(myforecast)
-        return forecasts
+        return self.coordinator.forecast_views.hourly
 
     async def async_forecast_daily(self) -> list[Forecast] | None:
         """Return the daily forecast."""
         if not self.coordinator.data or not self.coordinator.data["forecast"]:
             return None
-
-        daily_forecasts = []
-        # Group hourly forecasts by day
-        for day, hourly_group in groupby(
-            self.coordinator.data["forecast"],
-            key=lambda f: datetime.fromisoformat(f["datetime"]).date(),
-        ):
-            hourly_items = list(hourly_group)
-
-            # Extract temperatures, filtering out None values
-            temps = [
-                item["temperature"]
-                for item in hourly_items
-                if item["temperature"] is not None
-            ]
-            if not temps:
-                continue  # Skip day if no temperature data
-
-            # Find the most common condition and wind direction for the day
-            conditions = [
-                item["prediction"] for item in hourly_items if item["prediction"]
-            ]
-            worst_condition_for_day = None
-            if conditions:
-                # Iterate through our severity list (worst to best)
-                for severity in CONDITION_SEVERITY_ORDER:
-                    if severity in conditions:
-                        worst_condition_for_day = severity
-                        break  # Found the worst one, no need to check further
-
-                # Fallback in case a new, unknown condition appears
-                if not worst_condition_for_day:
-                    worst_condition_for_day = conditions[0]
-
-            wind_dirs = [item["wind_dir"] for item in hourly_items if item["wind_dir"]]
-
-            most_common_wind_dir = (
-                Counter(wind_dirs).most_common(1)[0][0] if wind_dirs else None
-            )
-
-            # Find max wind speed
-            wind_speeds = [
-                item["wind_kmh"]
-                for item in hourly_items
-                if item["wind_kmh"] is not None
-            ]
-
-            daily_forecasts.append(
-                Forecast(
-                    datetime=datetime.combine(day, datetime.min.time()).isoformat(),
-                    native_temperature=max(temps),
-                    native_templow=min(temps),
-                    condition=CONDITION_MAP.get(worst_condition_for_day, "unknown"),
-                    native_wind_speed=max(wind_speeds) if wind_speeds else None,
-                    wind_bearing=most_common_wind_dir,
-                )
-            )
-
-        self._daily_forecast = daily_forecasts  # Store for native_templow property
-        return daily_forecasts
+        return self.coordinator.forecast_views.daily
@@ -0,0 +1,10 @@
+"""Shared setup of the tests of the Meteo.gr integration.
+
+Only the modules which do not depend on Home Assistant are tested, imported
+the way the benchmarks import them.
+"""
+
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parents[1]))
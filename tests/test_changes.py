@@ -0,0 +1,67 @@
+"""Tests of diffing consecutive parses."""
+
+from benchmarks import load_integration_module
+
+changes = load_integration_module("changes")
+models = load_integration_module("models")
+
+
+def _station(name: str, temperature: float) -> "models.LiveObservation":
+    """Return an observation of a station."""
+    return models.LiveObservation(name, temperature, 60, 1013.0, 5.0, 1, "N")
+
+
+def _name(station) -> str:
+    """Return the key of a station."""
+    return station.name
+
+
+def test_unchanged_returns_previous() -> None:
+    """Equal records give back the previous list itself."""
+    previous = [_station("Athens", 20.0), _station("Patra", 18.0)]
+    current = [_station("Athens", 20.0), _station("Patra", 18.0)]
+    records, section = changes.diff_records(previous, current, _name)
+    assert records is previous
+    assert section is changes.NO_SECTION_CHANGES
+    assert not section
+
+
+def test_reordered_is_no_change() -> None:
+    """Records in another order are no change, but keep the new order."""
+    previous = [_station("Athens", 20.0), _station("Patra", 18.0)]
+    current = [_station("Patra", 18.0), _station("Athens", 20.0)]
+    records, section = changes.diff_records(previous, current, _name)
+    assert [record.name for record in records] == ["Patra", "Athens"]
+    assert records[0] is previous[1]
+    assert not section
+
+
+def test_added_removed_modified() -> None:
+    """Each key is told apart, and unchanged records keep their identity."""
+    previous = [
+        _station("Athens", 20.0),
+        _station("Patra", 18.0),
+        _station("Volos", 17.0),
+    ]
+    current = [
+        _station("Athens", 20.0),
+        _station("Patra", 19.0),
+        _station("Chania", 22.0),
+    ]
+    records, section = changes.diff_records(previous, current, _name)
+    assert records[0] is previous[0]
+    assert records[1] is current[1]
+    assert section.added == {"Chania"}
+    assert section.removed == {"Volos"}
+    assert section.modified == {"Patra"}
+    assert section.as_dict() == {"added": 1, "removed": 1, "modified": 1}
+    assert "Volos" in section
+    assert "Athens" not in section
+
+
+def test_change_set() -> None:
+    """A change set is true when any of its sections changed."""
+    assert not changes.NO_CHANGES
+    assert changes.ChangeSet(
+        forecast=changes.SectionChanges(modified=frozenset({1}))
+    )
@@ -0,0 +1,53 @@
+"""Tests of the rate limiting of the shared fetcher."""
+
+import asyncio
+import time
+
+from benchmarks import load_integration_module
+
+fetcher_module = load_integration_module("fetcher")
+
+
+async def _acquire_times(bucket, count: int) -> list[float]:
+    """Return how many seconds after the start each acquisition got through."""
+    start = time.monotonic()
+    times = []
+    for _ in range(count):
+        await bucket.acquire()
+        times.append(time.monotonic() - start)
+    return times
+
+
+def test_burst_then_rate() -> None:
+    """A full bucket lets a burst through, then requests follow the rate."""
+    bucket = fetcher_module.TokenBucket(rate=50, capacity=3)
+    times = asyncio.run(_acquire_times(bucket, 7))
+    assert times[2] < 0.01
+    # Four more at 50 per second
+    assert 0.075 <= times[6] < 0.5
+
+
+def test_refills_while_idle() -> None:
+    """Tokens come back while idle, but never beyond the capacity."""
+
+    async def acquire_after_idle() -> list[float]:
+        bucket = fetcher_module.TokenBucket(rate=20, capacity=2)
+        await _acquire_times(bucket, 2)
+        await asyncio.sleep(0.3)
+        return await _acquire_times(bucket, 3)
+
+    times = asyncio.run(acquire_after_idle())
+    assert times[1] < 0.01
+    assert 0.045 <= times[2] < 0.5
+
+
+def test_concurrent_waiters() -> None:
+    """Concurrent waiters share the rate."""
+
+    async def acquire_concurrently() -> float:
+        bucket = fetcher_module.TokenBucket(rate=50, capacity=1)
+        start = time.monotonic()
+        await asyncio.gather(*(bucket.acquire() for _ in range(5)))
+        return time.monotonic() - start
+
+    assert 0.075 <= asyncio.run(acquire_concurrently()) < 0.5
@@ -0,0 +1,91 @@
+"""Tests of the rolling statistics of the live stations."""
+
+from datetime import datetime, timedelta
+
+from benchmarks import load_integration_module
+
+history = load_integration_module("history")
+models = load_integration_module("models")
+
+HOUR = 3600
+
+
+def test_change_over_span() -> None:
+    """Values exactly one span old are still in the window."""
+    window = history.RollingWindow(3 * HOUR)
+    for hour, value in enumerate(range(10, 15)):
+        window.add(hour * HOUR, value)
+    assert len(window) == 4
+    assert window.change == 3.0
+    assert window.mean == 12.5
+    assert window.minimum == 11
+    assert window.maximum == 14
+
+
+def test_min_max_with_equal_timestamps() -> None:
+    """Dropping the oldest value keeps later values of the same timestamp."""
+    window = history.RollingWindow(None, capacity=2)
+    for value in (3, 3, 2):
+        window.add(0, value)
+    assert window.minimum == 2
+    assert window.maximum == 3
+
+    window = history.RollingWindow(None, capacity=3)
+    for value in (5, 1, 1, 7):
+        window.add(0, value)
+    assert window.minimum == 1
+    assert window.maximum == 7
+
+
+def test_min_max_against_brute_force() -> None:
+    """The monotonic queues agree with the values in the window."""
+    window = history.RollingWindow(10, capacity=8)
+    values = []
+    for step in range(200):
+        timestamp = step // 3
+        value = (step * 37) % 11
+        window.add(timestamp, value)
+        values.append((timestamp, value))
+        values = [item for item in values if item[0] >= timestamp - 10][-8:]
+        assert len(window) == len(values)
+        assert window.minimum == min(value for _, value in values)
+        assert window.maximum == max(value for _, value in values)
+        assert window.change == (
+            values[-1][1] - values[0][1] if len(values) > 1 else None
+        )
+
+
+def test_expire() -> None:
+    """Values expire without new ones, unless the window has no span."""
+    window = history.RollingWindow(HOUR)
+    window.add(0, 1.0)
+    window.add(10, 2.0)
+    assert window.expire(HOUR + 5)
+    assert len(window) == 1
+    assert window.minimum == 2.0
+    assert not window.expire(HOUR + 5)
+    assert not history.RollingWindow(None).expire(10 * HOUR)
+
+
+def _observation(temperature: float) -> "models.LiveObservation":
+    """Return an observation of a station."""
+    return models.LiveObservation("Athens", temperature, 60, 1013.0, 5.0, 1, "N")
+
+
+def test_station_history_advance() -> None:
+    """Recent values expire and the day rolls over without new observations."""
+    station = history.StationHistory()
+    noon = datetime(2024, 5, 1, 12)
+    station.add(_observation(20.0), noon)
+    station.add(_observation(18.0), noon + timedelta(hours=1))
+    assert station.temperature_recent.change == -2.0
+    assert station.temperature_today.maximum == 20.0
+
+    assert not station.advance(noon + timedelta(hours=2))
+    assert station.advance(noon + timedelta(hours=3, minutes=30))
+    assert len(station.temperature_recent) == 1
+    assert station.temperature_today.maximum == 20.0
+
+    assert station.advance(datetime(2024, 5, 2, 0, 5))
+    assert station.temperature_today.maximum is None
+    assert station.wind_today.maximum is None
@@ -0,0 +1,79 @@
+"""Tests of cutting the sections out of pages."""
+
+from datetime import date
+
+import pytest
+
+from benchmarks import load_integration_module
+from benchmarks.corpus import load_corpus, synthetic_page
+
+parsing = load_integration_module("parsing")
+
+CORPUS = load_corpus()
+
+
+def _scan(html: str, chunk_size: int) -> tuple[str, bool]:
+    """Feed a page to a scanner in chunks of a size.
+
+    Returns the markup of the scanner and whether it stopped before the end.
+    """
+    scanner = parsing.SectionScanner()
+    for start in range(0, len(html), chunk_size):
+        if scanner.feed(html[start : start + chunk_size]):
+            return scanner.markup(), start + chunk_size < len(html)
+    return scanner.markup(), False
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 100, 4096, 1 << 20])
+@pytest.mark.parametrize("name", sorted(CORPUS))
+def test_scanner_matches_extract(name: str, chunk_size: int) -> None:
+    """The scanner cuts out the same sections as the whole page extractors."""
+    html = CORPUS[name]
+    markup, _ = _scan(html, chunk_size)
+    assert markup == parsing.extract_live(html) + parsing.extract_forecast(html)
+
+
+def test_scanner_stops_at_footer() -> None:
+    """The rest of the page is not needed once the footer follows the sections."""
+    html = synthetic_page(date(2024, 5, 1), step=3)
+    markup, stopped = _scan(html, 100)
+    assert stopped
+    assert markup == parsing.extract_live(html) + parsing.extract_forecast(html)
+
+
+def test_scanner_without_footer() -> None:
+    """Without a footer, the sections run to the end of the page."""
+    html = synthetic_page(date(2024, 5, 1), step=3)
+    html = html[: html.index("<footer")]
+    scanner = parsing.SectionScanner()
+    assert not scanner.feed(html)
+    assert scanner.markup() == (
+        parsing.extract_live(html) + parsing.extract_forecast(html)
+    )
+
+
+def test_scanner_sections_while_fed() -> None:
+    """Each section is available once closed, before the page was all fed."""
+    html = synthetic_page(date(2024, 5, 1), step=3)
+    scanner = parsing.SectionScanner()
+    scanner.feed(html[: html.index("<footer")])
+    assert scanner.live == parsing.extract_live(html)
+    assert "".join(scanner.tables) == parsing.extract_forecast(html)
+
+
+@pytest.mark.parametrize(
+    "backend", [parsing.PARSER_BEAUTIFULSOUP, parsing.PARSER_LXML]
+)
+@pytest.mark.parametrize("name", sorted(CORPUS))
+def test_tables_parse_like_forecast(name: str, backend: str) -> None:
+    """Parsing the forecast table by table gives the forecast of the page."""
+    html = CORPUS[name]
+    scanner = parsing.SectionScanner()
+    scanner.feed(html)
+    scanner.markup()
+    parser = parsing.get_parser(backend)
+    slots = [slot for table in scanner.tables for slot in parser.parse_forecast(table)]
+    assert slots == parser.parse_forecast(parsing.extract_forecast(html))
+    assert parser.parse_live(scanner.live or "") == parser.parse_live(
+        parsing.extract_live(html)
+    )
@@ -0,0 +1,82 @@
+"""Tests of the adaptive refresh scheduling."""
+
+from datetime import datetime, timedelta
+
+from benchmarks import load_integration_module
+
+scheduler_module = load_integration_module("scheduler")
+
+START = datetime(2024, 5, 1, 12)
+MINIMUM = timedelta(minutes=1)
+MAXIMUM = timedelta(hours=1)
+FALLBACK = timedelta(minutes=10)
+
+
+def _interval(scheduler, now: datetime, **kwargs) -> timedelta:
+    """Return the next interval with the test limits."""
+    return scheduler.next_interval(now, MINIMUM, MAXIMUM, FALLBACK, **kwargs)
+
+
+def _learned() -> "scheduler_module.AdaptiveScheduler":
+    """Return a scheduler which saw the live section change every 10 minutes."""
+    scheduler = scheduler_module.AdaptiveScheduler(("live", "forecast"))
+    for number in range(4):
+        scheduler.observe("live", bytes([number]), START + number * FALLBACK)
+    return scheduler
+
+
+def test_fallback_until_learned() -> None:
+    """The fallback is used until a section changed twice."""
+    scheduler = scheduler_module.AdaptiveScheduler(("live",))
+    assert scheduler.observe("live", b"a", START)
+    assert _interval(scheduler, START) == FALLBACK
+    assert scheduler.observe("live", b"b", START + FALLBACK)
+    assert _interval(scheduler, START + FALLBACK) == FALLBACK
+    assert not scheduler.observe("live", b"b", START + 2 * FALLBACK)
+
+
+def test_sleeps_until_expected_change() -> None:
+    """Polls wait until the expected change gets close, then are dense."""
+    scheduler = _learned()
+    last_change = START + 3 * FALLBACK
+    assert _interval(scheduler, last_change, sections=["live"]) == timedelta(
+        minutes=9
+    )
+    assert _interval(scheduler, last_change + FALLBACK, sections=["live"]) == MINIMUM
+
+
+def test_backs_off_when_late() -> None:
+    """A missed change backs off exponentially, up to the maximum."""
+    scheduler = _learned()
+    now = START + 3 * FALLBACK + timedelta(minutes=12)
+    for misses in range(1, 100):
+        assert not scheduler.observe("live", bytes([3]), now)
+        # A minute doubled six times is past the hour
+        assert _interval(scheduler, now, sections=["live"]) == (
+            MINIMUM * 2**misses if misses < 6 else MAXIMUM
+        )
+    # The late change lengthens the learned period to 636 seconds
+    assert scheduler.observe("live", b"new", now)
+    assert _interval(scheduler, now, sections=["live"]) == timedelta(
+        seconds=636 * 0.9
+    )
+
+
+def test_backoff_stays_bounded() -> None:
+    """A section which never changes again backs off without overflowing."""
+    scheduler = _learned()
+    now = START + 3 * FALLBACK
+    for _ in range(1000):
+        now += MAXIMUM
+        scheduler.observe("live", bytes([3]), now)
+        assert _interval(scheduler, now, sections=["live"]) <= MAXIMUM
+    assert _interval(scheduler, now, sections=["live"]) == MAXIMUM
+
+
+def test_soonest_section_wins() -> None:
+    """The interval is the shortest of the sections asked about."""
+    scheduler = _learned()
+    now = START + 3 * FALLBACK
+    # The forecast never changed, so its fallback comes first
+    assert _interval(scheduler, now, sections=["forecast"]) == FALLBACK
+    assert _interval(scheduler, now) == timedelta(minutes=9)